@@ -0,0 +1,66 @@
+"""One-time backfill: build conversation_meta summaries from existing messages.
+
+Run once after deploying the server version that maintains conversation_meta
+(the server's startup creates the unique index $merge relies on):
+
+    python backfill_conversation_meta.py
+"""
+import asyncio
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env', override=True)
+
+PIPELINE = [
+    {"$sort": {"created_at": -1}},
+    # Each message belongs to two conversations: the sender's and the recipient's
+    {"$project": {
+        "content": 1,
+        "created_at": 1,
+        "listing_id": 1,
+        "sides": [
+            {"user_id": "$sender_id", "partner_id": "$recipient_id", "unread": 0},
+            {"user_id": "$recipient_id", "partner_id": "$sender_id",
+             "unread": {"$cond": [{"$eq": ["$is_read", True]}, 0, 1]}}
+        ]
+    }},
+    {"$unwind": "$sides"},
+    {"$group": {
+        "_id": {"user_id": "$sides.user_id", "partner_id": "$sides.partner_id"},
+        "last_message": {"$first": "$content"},
+        "last_message_time": {"$first": "$created_at"},
+        "listing_id": {"$first": "$listing_id"},
+        "unread": {"$sum": "$sides.unread"}
+    }},
+    {"$project": {
+        "_id": 0,
+        "user_id": "$_id.user_id",
+        "partner_id": "$_id.partner_id",
+        "last_message": 1,
+        "last_message_time": 1,
+        "listing_id": 1,
+        "unread": 1
+    }},
+    {"$merge": {
+        "into": "conversation_meta",
+        "on": ["user_id", "partner_id"],
+        "whenMatched": "replace",
+        "whenNotMatched": "insert"
+    }}
+]
+
+async def main():
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    await db.messages.aggregate(PIPELINE, allowDiskUse=True).to_list(None)
+    print(f"conversation_meta: {await db.conversation_meta.count_documents({})} summaries")
+
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
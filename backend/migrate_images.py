@@ -0,0 +1,62 @@
+"""One-time migration: move inline base64 images into GridFS.
+
+Run once after deploying the server version that stores uploads in GridFS;
+until then get_image keeps decoding the legacy documents on every read:
+
+    python migrate_images.py
+"""
+import asyncio
+import base64
+import binascii
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env', override=True)
+
+def parse_data_url(data: str) -> tuple[str, str]:
+    """Split a base64 data URL into (content_type, base64_payload), as the server does"""
+    if ',' in data:
+        header, data = data.split(',', 1)
+        content_type = header.split(':')[1].split(';')[0] if ':' in header else 'image/jpeg'
+    else:
+        content_type = 'image/jpeg'
+    return content_type, data
+
+async def main():
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    images_fs = AsyncIOMotorGridFSBucket(db, bucket_name="image_files")
+
+    migrated = corrupt = 0
+    async for image in db.images.find({"file_id": {"$exists": False}}, {"_id": 0}):
+        content_type, data = parse_data_url(image["data"])
+        try:
+            image_bytes = base64.b64decode(data)
+        except binascii.Error:
+            corrupt += 1
+            print(f"images.{image['id']}: invalid base64, left inline")
+            continue
+
+        file_id = await images_fs.upload_from_stream(
+            image["filename"],
+            image_bytes,
+            metadata={"image_id": image["id"], "content_type": content_type}
+        )
+        await db.images.update_one(
+            {"id": image["id"]},
+            {
+                "$set": {"content_type": content_type, "size": len(image_bytes), "file_id": file_id},
+                "$unset": {"data": ""}
+            }
+        )
+        migrated += 1
+
+    print(f"images: {migrated} moved to GridFS, {corrupt} left inline")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
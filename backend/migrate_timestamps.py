@@ -0,0 +1,45 @@
+"""One-time migration: rewrite ISO8601 timestamp strings as native BSON dates.
+
+Run once after deploying the server version that writes datetime objects:
+
+    python migrate_timestamps.py
+"""
+import asyncio
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env', override=True)
+
+TIMESTAMP_FIELDS = {
+    "users": ["created_at"],
+    "verification_codes": ["created_at"],
+    "listings": ["created_at"],
+    "bookings": ["created_at", "receipt_confirmed_at", "dispute_date"],
+    "reviews": ["created_at"],
+    "messages": ["created_at"],
+    "payment_transactions": ["created_at"],
+    "payouts": ["created_at"],
+    "payout_requests": ["created_at"],
+    "images": ["created_at"],
+}
+
+async def main():
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+
+    for collection, fields in TIMESTAMP_FIELDS.items():
+        for field in fields:
+            result = await db[collection].update_many(
+                {field: {"$type": "string"}},
+                [{"$set": {field: {"$toDate": f"${field}"}}}]
+            )
+            print(f"{collection}.{field}: {result.modified_count} converted")
+
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,22 +1,37 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import os
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import random
+import time
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
 from typing import List, Optional, Dict
 import uuid
+import base64
+import binascii
+import orjson
 from datetime import datetime, timezone, timedelta
 import bcrypt
 import jwt
 import stripe
 from emergentintegrations.payments.stripe.checkout import StripeCheckout, CheckoutSessionResponse, CheckoutStatusResponse, CheckoutSessionRequest
 from twilio.rest import Client as TwilioClient
+from pricing import PricingError, price_booking
+
+try:
+    import re2  # google-re2, optional
+except ImportError:
+    re2 = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env', override=True)
@@ -26,8 +41,9 @@ STATIC_DIR = ROOT_DIR / "static"
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
+images_fs = AsyncIOMotorGridFSBucket(db, bucket_name="image_files")
 
 # JWT Config - MUST be set in environment
 JWT_SECRET = os.environ.get('JWT_SECRET')
@@ -36,13 +52,20 @@ if not JWT_SECRET:
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# bcrypt cost factor (log2 of the key-expansion iterations)
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+
 # Stripe Config - MUST be set in environment
 STRIPE_API_KEY = os.environ.get('STRIPE_API_KEY')
 if not STRIPE_API_KEY:
     raise ValueError("STRIPE_API_KEY environment variable is required")
-PLATFORM_FEE_PERCENT = 5.0
 stripe.api_key = STRIPE_API_KEY
 
+# Queued or failed owner payouts are re-sent this often (seconds), up to
+# PAYOUT_MAX_ATTEMPTS failures before they are left for an operator
+PAYOUT_RETRY_INTERVAL = int(os.environ.get('PAYOUT_RETRY_INTERVAL', '300'))
+PAYOUT_MAX_ATTEMPTS = 5
+
 # Twilio Config
 TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN')
@@ -52,7 +75,7 @@ if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN:
     twilio_client = TwilioClient(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
 
 # Create the main app
-app = FastAPI(title="RentAll API")
+app = FastAPI(title="RentAll API", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -69,7 +92,7 @@ class UserCreate(UserBase):
 class UserResponse(UserBase):
     model_config = ConfigDict(extra="ignore")
     id: str
-    created_at: str
+    created_at: datetime
     avatar_url: Optional[str] = None
     location: Optional[str] = None
     bio: Optional[str] = None
@@ -124,7 +147,7 @@ class ListingResponse(ListingBase):
     owner_name: str
     owner_avatar: Optional[str] = None
     owner_verified: bool = False
-    created_at: str
+    created_at: datetime
     avg_rating: float = 0.0
     review_count: int = 0
     is_available: bool = True
@@ -157,7 +180,7 @@ class BookingResponse(BookingBase):
     total_price: float
     platform_fee: float
     status: str
-    created_at: str
+    created_at: datetime
     listing_title: Optional[str] = None
     listing_image: Optional[str] = None
     duration_type: str = "daily"
@@ -171,7 +194,7 @@ class BookingResponse(BookingBase):
     # Escrow fields
     escrow_status: Optional[str] = "held"  # held, released, refunded
     receipt_confirmed: Optional[bool] = False
-    receipt_confirmed_at: Optional[str] = None
+    receipt_confirmed_at: Optional[datetime] = None
     auto_release_date: Optional[str] = None
 
 class ReviewBase(BaseModel):
@@ -188,7 +211,7 @@ class ReviewResponse(ReviewBase):
     reviewer_id: str
     reviewer_name: str
     reviewer_avatar: Optional[str] = None
-    created_at: str
+    created_at: datetime
 
 class MessageBase(BaseModel):
     recipient_id: str
@@ -204,7 +227,7 @@ class MessageResponse(MessageBase):
     sender_id: str
     sender_name: str
     sender_avatar: Optional[str] = None
-    created_at: str
+    created_at: datetime
     is_read: bool = False
 
 class ConversationResponse(BaseModel):
@@ -212,7 +235,7 @@ class ConversationResponse(BaseModel):
     user_name: str
     user_avatar: Optional[str] = None
     last_message: str
-    last_message_time: str
+    last_message_time: datetime
     unread_count: int
     listing_id: Optional[str] = None
     listing_title: Optional[str] = None
@@ -233,21 +256,65 @@ class PaymentTransaction(BaseModel):
     owner_amount: float
     status: str
     payment_status: str
-    created_at: str
+    created_at: datetime
     metadata: Dict = {}
 
+# ============== ID HELPERS ==============
+
+def new_id() -> str:
+    """Generate a compact 22-char URL-safe ID from a random UUID"""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode()
+
+def response_projection(model: type[BaseModel]) -> dict:
+    """Mongo projection returning exactly a response model's fields"""
+    return {"_id": 0, **{field: 1 for field in model.model_fields}}
+
+def as_datetime(value):
+    """Timestamp as a datetime; ISO strings remain until migrate_timestamps.py has run"""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+# ============== RESPONSE CACHE ==============
+
+# Short-lived in-process cache for read-heavy public endpoints. The app runs as
+# a single uvicorn process, so writes invalidate their keys directly.
+RESPONSE_CACHE_TTL = 30  # seconds
+RESPONSE_CACHE_MAX_ENTRIES = 10000
+_response_cache: Dict[str, tuple] = {}
+
+def cache_get(key: str) -> Optional[bytes]:
+    entry = _response_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+def cache_set(key: str, body: bytes, ttl: int = RESPONSE_CACHE_TTL):
+    now = time.monotonic()
+    if len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+        for stale in [k for k, (expires, _) in _response_cache.items() if expires <= now]:
+            del _response_cache[stale]
+        if len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+            _response_cache.clear()
+    _response_cache[key] = (now + ttl, body)
+
+def cache_invalidate(key: str):
+    _response_cache.pop(key, None)
+
+def json_bytes_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
 # ============== AUTH HELPERS ==============
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode(), hashed.encode())
 
-def create_token(user_id: str) -> str:
+def create_token(user_id: str, now: Optional[datetime] = None) -> str:
+    now = now or datetime.now(timezone.utc)
     payload = {
         "user_id": user_id,
-        "exp": datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
+        "exp": now + timedelta(hours=JWT_EXPIRATION_HOURS)
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
@@ -272,17 +339,18 @@ async def get_current_user(request: Request) -> dict:
 
 @api_router.post("/auth/register", response_model=TokenResponse)
 async def register(user_data: UserCreate):
-    existing = await db.users.find_one({"email": user_data.email})
+    existing = await db.users.find_one({"email": user_data.email}, {"_id": 1})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    user_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    user_id = new_id()
     user_doc = {
         "id": user_id,
         "email": user_data.email,
         "name": user_data.name,
         "password": hash_password(user_data.password),
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": now,
         "avatar_url": None,
         "location": None,
         "bio": None,
@@ -293,7 +361,7 @@ async def register(user_data: UserCreate):
     }
     await db.users.insert_one(user_doc)
     
-    token = create_token(user_id)
+    token = create_token(user_id, now)
     user_response = UserResponse(
         id=user_id,
         email=user_data.email,
@@ -376,6 +444,7 @@ async def send_phone_verification_code(
     code = str(random.randint(100000, 999999))
     
     # Store code in database with expiry
+    now = datetime.now(timezone.utc)
     await db.verification_codes.update_one(
         {"user_id": current_user["id"], "type": "phone"},
         {
@@ -384,8 +453,9 @@ async def send_phone_verification_code(
                 "type": "phone",
                 "phone_number": data.phone_number,
                 "code": code,
-                "expires_at": (datetime.now(timezone.utc) + timedelta(minutes=10)).isoformat(),
-                "created_at": datetime.now(timezone.utc).isoformat()
+                # Stored as a BSON date so the TTL index can expire it
+                "expires_at": now + timedelta(minutes=10),
+                "created_at": now
             }
         },
         upsert=True
@@ -393,7 +463,8 @@ async def send_phone_verification_code(
     
     # Send SMS via Twilio
     try:
-        message = twilio_client.messages.create(
+        message = await asyncio.to_thread(
+            twilio_client.messages.create,
             body=f"Your RentAll verification code is: {code}. Valid for 10 minutes.",
             from_=TWILIO_PHONE_NUMBER,
             to=data.phone_number
@@ -408,24 +479,17 @@ async def verify_phone_code(
     data: PhoneVerifyCode,
     current_user: dict = Depends(get_current_user)
 ):
-    # Find verification code
-    verification = await db.verification_codes.find_one({
+    # Consume a matching, unexpired code atomically
+    verification = await db.verification_codes.find_one_and_delete({
         "user_id": current_user["id"],
         "type": "phone",
-        "phone_number": data.phone_number
+        "phone_number": data.phone_number,
+        "code": data.code,
+        "expires_at": {"$gt": datetime.now(timezone.utc)}
     })
     
     if not verification:
-        raise HTTPException(status_code=400, detail="No verification code found")
-    
-    # Check if expired
-    expires_at = datetime.fromisoformat(verification["expires_at"].replace('Z', '+00:00'))
-    if datetime.now(timezone.utc) > expires_at:
-        raise HTTPException(status_code=400, detail="Verification code expired")
-    
-    # Check code
-    if verification["code"] != data.code:
-        raise HTTPException(status_code=400, detail="Invalid verification code")
+        raise HTTPException(status_code=400, detail="Invalid or expired verification code")
     
     # Mark phone as verified
     await db.users.update_one(
@@ -433,9 +497,6 @@ async def verify_phone_code(
         {"$set": {"phone_verified": True, "phone_number": data.phone_number}}
     )
     
-    # Delete verification code
-    await db.verification_codes.delete_one({"user_id": current_user["id"], "type": "phone"})
-    
     return {"message": "Phone number verified successfully"}
 
 # ============== STRIPE CONNECT ==============
@@ -453,7 +514,8 @@ async def create_stripe_connect_account(
         # Check if user already has a Stripe account
         if current_user.get("stripe_account_id"):
             # Create new account link for existing account
-            account_link = stripe.AccountLink.create(
+            account_link = await asyncio.to_thread(
+                stripe.AccountLink.create,
                 account=current_user["stripe_account_id"],
                 refresh_url=f"{data.return_url}?refresh=true",
                 return_url=f"{data.return_url}?success=true",
@@ -463,7 +525,8 @@ async def create_stripe_connect_account(
         
         # Create new Stripe Connect Express account
         # Note: Don't specify country - let Stripe determine from user's location
-        account = stripe.Account.create(
+        account = await asyncio.to_thread(
+            stripe.Account.create,
             type="express",
             email=current_user["email"],
             capabilities={
@@ -483,7 +546,8 @@ async def create_stripe_connect_account(
         )
         
         # Create account link for onboarding
-        account_link = stripe.AccountLink.create(
+        account_link = await asyncio.to_thread(
+            stripe.AccountLink.create,
             account=account.id,
             refresh_url=f"{data.return_url}?refresh=true",
             return_url=f"{data.return_url}?success=true",
@@ -512,7 +576,7 @@ async def get_stripe_connect_status(current_user: dict = Depends(get_current_use
         }
     
     try:
-        account = stripe.Account.retrieve(stripe_account_id)
+        account = await asyncio.to_thread(stripe.Account.retrieve, stripe_account_id)
         
         is_connected = account.details_submitted and account.charges_enabled
         
@@ -546,7 +610,7 @@ async def get_stripe_dashboard_link(current_user: dict = Depends(get_current_use
         raise HTTPException(status_code=400, detail="No Stripe account connected")
     
     try:
-        login_link = stripe.Account.create_login_link(stripe_account_id)
+        login_link = await asyncio.to_thread(stripe.Account.create_login_link, stripe_account_id)
         return {"url": login_link.url}
     except stripe.error.StripeError as e:
         logging.error(f"Stripe dashboard error: {e}")
@@ -559,7 +623,7 @@ async def create_listing(
     listing_data: ListingCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    listing_id = str(uuid.uuid4())
+    listing_id = new_id()
     listing_doc = {
         "id": listing_id,
         "owner_id": current_user["id"],
@@ -567,7 +631,7 @@ async def create_listing(
         "owner_avatar": current_user.get("avatar_url"),
         "owner_verified": current_user.get("phone_verified", False),
         **listing_data.model_dump(),
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": datetime.now(timezone.utc),
         "avg_rating": 0.0,
         "review_count": 0,
         "is_available": True
@@ -635,7 +699,7 @@ async def update_listing(
     updates: dict,
     current_user: dict = Depends(get_current_user)
 ):
-    listing = await db.listings.find_one({"id": listing_id})
+    listing = await db.listings.find_one({"id": listing_id}, {"owner_id": 1})
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found")
     if listing["owner_id"] != current_user["id"]:
@@ -655,7 +719,7 @@ async def delete_listing(
     listing_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    listing = await db.listings.find_one({"id": listing_id})
+    listing = await db.listings.find_one({"id": listing_id}, {"owner_id": 1})
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found")
     if listing["owner_id"] != current_user["id"]:
@@ -671,127 +735,44 @@ async def create_booking(
     booking_data: BookingCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    listing = await db.listings.find_one({"id": booking_data.listing_id}, {"_id": 0})
+    # Fetch the listing and check for conflicting bookings in parallel
+    listing, conflict = await asyncio.gather(
+        db.listings.find_one({"id": booking_data.listing_id}, {"_id": 0}),
+        db.bookings.find_one({
+            "listing_id": booking_data.listing_id,
+            "status": {"$in": ["pending", "confirmed", "paid"]},
+            "$or": [
+                {"start_date": {"$lte": booking_data.end_date}, "end_date": {"$gte": booking_data.start_date}}
+            ]
+        }, {"_id": 1})
+    )
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found")
     
     if listing["owner_id"] == current_user["id"]:
         raise HTTPException(status_code=400, detail="Cannot book your own listing")
     
-    # Check for conflicting bookings
     start_date = datetime.fromisoformat(booking_data.start_date)
     end_date = datetime.fromisoformat(booking_data.end_date)
     
     if end_date < start_date:
         raise HTTPException(status_code=400, detail="End date must be after start date")
     
-    conflict = await db.bookings.find_one({
-        "listing_id": booking_data.listing_id,
-        "status": {"$in": ["pending", "confirmed", "paid"]},
-        "$or": [
-            {"start_date": {"$lte": booking_data.end_date}, "end_date": {"$gte": booking_data.start_date}}
-        ]
-    })
-    
     if conflict:
         raise HTTPException(status_code=400, detail="Dates not available")
     
     # Calculate price based on duration type
     duration_type = booking_data.duration_type or "daily"
     hours = booking_data.hours
-    days = (end_date - start_date).days or 1
-    
-    # Helper function to check if a date has surge pricing
-    def is_surge_date(check_date: datetime) -> bool:
-        if not listing.get("surge_enabled", False):
-            return False
-        # Check weekends
-        if listing.get("surge_weekends", True) and check_date.weekday() >= 5:
-            return True
-        # Check custom surge dates
-        surge_dates = listing.get("surge_dates", [])
-        date_str = check_date.strftime("%Y-%m-%d")
-        return date_str in surge_dates
-    
-    # Count surge days
-    surge_days = 0
-    if listing.get("surge_enabled", False) and duration_type in ["daily", "weekly"]:
-        current = start_date
-        while current < end_date:
-            if is_surge_date(current):
-                surge_days += 1
-            current += timedelta(days=1)
-    
-    surge_percentage = listing.get("surge_percentage", 20.0) or 20.0
-    
-    if duration_type == "hourly":
-        price_per_hour = listing.get("price_per_hour")
-        if not price_per_hour:
-            raise HTTPException(status_code=400, detail="Hourly rental not available for this listing")
-        if not hours or hours < 1:
-            raise HTTPException(status_code=400, detail="Hours must be specified for hourly booking")
-        min_hours = listing.get("min_rental_hours", 1)
-        if hours < min_hours:
-            raise HTTPException(status_code=400, detail=f"Minimum {min_hours} hours required")
-        base_price = price_per_hour * hours
-        # Apply surge for hourly if booking date is a surge date
-        if is_surge_date(start_date):
-            surge_amount = base_price * (surge_percentage / 100)
-            total_price = round(base_price + surge_amount, 2)
-        else:
-            total_price = round(base_price, 2)
-    elif duration_type == "weekly":
-        price_per_week = listing.get("price_per_week")
-        if not price_per_week:
-            raise HTTPException(status_code=400, detail="Weekly rental not available for this listing")
-        weeks = max(1, days // 7)
-        remaining_days = days % 7
-        price_per_day = listing.get("price_per_day") or (price_per_week / 7)
-        base_price = (price_per_week * weeks) + (price_per_day * remaining_days)
-        # Apply surge for surge days
-        if surge_days > 0:
-            surge_amount = (price_per_day * surge_days) * (surge_percentage / 100)
-            base_price += surge_amount
-        total_price = round(base_price, 2)
-    else:  # daily (default)
-        price_per_day = listing.get("price_per_day")
-        if not price_per_day:
-            raise HTTPException(status_code=400, detail="Daily rental not available for this listing")
-        if days < 1:
-            days = 1
-        min_days = listing.get("min_rental_days", 1)
-        if days < min_days:
-            raise HTTPException(status_code=400, detail=f"Minimum {min_days} days required")
-        
-        # Calculate base price
-        normal_days = days - surge_days
-        base_price = price_per_day * normal_days
-        surge_price = price_per_day * surge_days * (1 + surge_percentage / 100)
-        total_price = round(base_price + surge_price, 2)
-    
-    # Apply long-term discounts
-    discount_applied = 0.0
-    discount_label = None
-    if days >= 90 and listing.get("discount_quarterly", 0) > 0:
-        discount_applied = listing["discount_quarterly"]
-        discount_label = "90+ days"
-    elif days >= 30 and listing.get("discount_monthly", 0) > 0:
-        discount_applied = listing["discount_monthly"]
-        discount_label = "30+ days"
-    elif days >= 7 and listing.get("discount_weekly", 0) > 0:
-        discount_applied = listing["discount_weekly"]
-        discount_label = "7+ days"
-    
-    if discount_applied > 0:
-        discount_amount = total_price * (discount_applied / 100)
-        total_price = round(total_price - discount_amount, 2)
-    
-    platform_fee = round(total_price * (PLATFORM_FEE_PERCENT / 100), 2)
+    try:
+        pricing = price_booking(listing, start_date, end_date, duration_type, hours)
+    except PricingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Calculate auto-release date (3 days after rental end date)
     auto_release_date = (end_date + timedelta(days=3)).isoformat()
     
-    booking_id = str(uuid.uuid4())
+    booking_id = new_id()
     booking_doc = {
         "id": booking_id,
         "listing_id": booking_data.listing_id,
@@ -804,39 +785,44 @@ async def create_booking(
         "end_date": booking_data.end_date,
         "duration_type": duration_type,
         "hours": hours,
-        "surge_days": surge_days,
-        "surge_percentage": surge_percentage if surge_days > 0 else 0,
-        "discount_applied": discount_applied,
-        "discount_label": discount_label,
-        "total_price": total_price,
-        "platform_fee": platform_fee,
+        **pricing,
         "status": "pending",
         # Escrow fields
         "escrow_status": "pending",  # pending -> held -> released/refunded
         "receipt_confirmed": False,
         "receipt_confirmed_at": None,
         "auto_release_date": auto_release_date,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     
     await db.bookings.insert_one(booking_doc)
+    cache_invalidate(f"booked_dates:{booking_data.listing_id}")
     return BookingResponse(**booking_doc)
 
-@api_router.get("/bookings/my", response_model=List[BookingResponse])
+def booking_list_item(booking: dict) -> dict:
+    """Serialize a stored booking for the list endpoints without re-validating it"""
+    # model_construct fills defaults for older bookings; legacy ISO string
+    # timestamps are parsed first so the dump doesn't warn on every response
+    for field in ("created_at", "receipt_confirmed_at"):
+        if field in booking:
+            booking[field] = as_datetime(booking[field])
+    return BookingResponse.model_construct(**booking).model_dump()
+
+@api_router.get("/bookings/my", responses={200: {"model": List[BookingResponse]}})
 async def get_my_bookings(current_user: dict = Depends(get_current_user)):
     bookings = await db.bookings.find(
         {"renter_id": current_user["id"]},
-        {"_id": 0}
+        response_projection(BookingResponse)
     ).sort("created_at", -1).to_list(100)
-    return [BookingResponse(**b) for b in bookings]
+    return ORJSONResponse([booking_list_item(b) for b in bookings])
 
-@api_router.get("/bookings/requests", response_model=List[BookingResponse])
+@api_router.get("/bookings/requests", responses={200: {"model": List[BookingResponse]}})
 async def get_booking_requests(current_user: dict = Depends(get_current_user)):
     bookings = await db.bookings.find(
         {"owner_id": current_user["id"]},
-        {"_id": 0}
+        response_projection(BookingResponse)
     ).sort("created_at", -1).to_list(100)
-    return [BookingResponse(**b) for b in bookings]
+    return ORJSONResponse([booking_list_item(b) for b in bookings])
 
 @api_router.get("/bookings/{booking_id}", response_model=BookingResponse)
 async def get_booking(booking_id: str, current_user: dict = Depends(get_current_user)):
@@ -855,7 +841,7 @@ async def update_booking_status(
     status: str,
     current_user: dict = Depends(get_current_user)
 ):
-    booking = await db.bookings.find_one({"id": booking_id})
+    booking = await db.bookings.find_one({"id": booking_id}, {"owner_id": 1, "listing_id": 1})
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -866,66 +852,159 @@ async def update_booking_status(
         raise HTTPException(status_code=400, detail="Invalid status")
     
     await db.bookings.update_one({"id": booking_id}, {"$set": {"status": status}})
+    cache_invalidate(f"booked_dates:{booking['listing_id']}")
     return {"message": f"Booking {status}"}
 
+async def send_owner_transfer(booking_id: str, amount: float, destination: str, idempotency_key: Optional[str] = None):
+    """Transfer a released escrow payout to the owner's Stripe Connect account"""
+    try:
+        transfer = await asyncio.to_thread(
+            stripe.Transfer.create,
+            amount=int(amount * 100),  # Convert to cents
+            currency="aud",
+            destination=destination,
+            description=f"Payout for booking {booking_id}",
+            idempotency_key=idempotency_key or f"payout-{booking_id}"
+        )
+    except Exception as e:
+        logging.error(f"Stripe transfer failed: {e}")
+        failure = [{"$set": {"status": "failed", "attempts": {"$add": [{"$ifNull": ["$attempts", 0]}, 1]}}}]
+        # Stripe replays a key's first response for 24 hours, errors included, so a
+        # transfer Stripe rejected is retried under a new key. When the outcome is
+        # unknown (no response came back) the key is kept, so a transfer that did
+        # go through is never repeated.
+        if isinstance(e, stripe.error.StripeError) and e.http_status is not None:
+            failure.append({"$set": {"idempotency_key": {"$concat": [f"payout-{booking_id}-", {"$toString": "$attempts"}]}}})
+        payout = await db.payouts.find_one_and_update(
+            {"booking_id": booking_id},
+            failure,
+            projection={"_id": 0, "attempts": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if payout and payout["attempts"] >= PAYOUT_MAX_ATTEMPTS:
+            logging.error(f"Payout for booking {booking_id} failed {payout['attempts']} times; no more retries, transfer it manually")
+        return
+    
+    logging.info(f"Stripe transfer created: {transfer.id}")
+    await db.payouts.update_one(
+        {"booking_id": booking_id},
+        {"$set": {"status": "paid", "transfer_id": transfer.id}}
+    )
+
+async def retry_stalled_payouts():
+    """Re-send payouts a restart left queued or Stripe rejected, under each payout's current idempotency key"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=PAYOUT_RETRY_INTERVAL)
+    payouts = await db.payouts.find(
+        {
+            "status": {"$in": ["queued", "failed"]},
+            # Skip payouts whose first transfer may still be in flight
+            "queued_at": {"$not": {"$gte": cutoff}},
+            "attempts": {"$not": {"$gte": PAYOUT_MAX_ATTEMPTS}}
+        },
+        {"_id": 0, "booking_id": 1, "owner_id": 1, "amount": 1, "idempotency_key": 1}
+    ).to_list(None)
+    if not payouts:
+        return
+    
+    owners = await db.users.find(
+        {
+            "id": {"$in": list({p["owner_id"] for p in payouts})},
+            "stripe_account_id": {"$ne": None},
+            "stripe_onboarding_complete": True
+        },
+        {"_id": 0, "id": 1, "stripe_account_id": 1}
+    ).to_list(None)
+    destinations = {owner["id"]: owner["stripe_account_id"] for owner in owners}
+    for payout in payouts:
+        if payout["owner_id"] in destinations:
+            await send_owner_transfer(
+                payout["booking_id"], payout["amount"], destinations[payout["owner_id"]], payout.get("idempotency_key")
+            )
+
+async def payout_retry_loop():
+    while True:
+        try:
+            await retry_stalled_payouts()
+        except Exception as e:
+            logging.error(f"Payout retry sweep failed: {e}")
+        await asyncio.sleep(PAYOUT_RETRY_INTERVAL)
+
 @api_router.post("/bookings/{booking_id}/confirm-receipt")
 async def confirm_receipt(
     booking_id: str,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     """Renter confirms they received the item - releases escrow to owner"""
-    booking = await db.bookings.find_one({"id": booking_id})
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    
-    # Only renter can confirm receipt
-    if booking["renter_id"] != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Only the renter can confirm receipt")
-    
-    # Must be in paid status
-    if booking["status"] != "paid":
-        raise HTTPException(status_code=400, detail="Booking must be paid first")
-    
-    # Already confirmed
-    if booking.get("receipt_confirmed"):
-        raise HTTPException(status_code=400, detail="Receipt already confirmed")
-    
-    # Update booking
-    await db.bookings.update_one(
-        {"id": booking_id},
+    # The filter is the guard: only the renter can move a paid booking to
+    # completed, and only once, so concurrent confirms cannot double-release
+    booking = await db.bookings.find_one_and_update(
+        {
+            "id": booking_id,
+            "renter_id": current_user["id"],
+            "status": "paid",
+            "receipt_confirmed": {"$ne": True}
+        },
         {
             "$set": {
                 "receipt_confirmed": True,
-                "receipt_confirmed_at": datetime.now(timezone.utc).isoformat(),
+                "receipt_confirmed_at": datetime.now(timezone.utc),
                 "escrow_status": "released",
                 "status": "completed"
             }
-        }
+        },
+        projection={"_id": 0, "listing_id": 1, "owner_id": 1, "total_price": 1, "platform_fee": 1},
+        return_document=ReturnDocument.BEFORE
     )
+    if not booking:
+        existing = await db.bookings.find_one(
+            {"id": booking_id},
+            {"_id": 0, "renter_id": 1, "status": 1, "receipt_confirmed": 1}
+        )
+        if not existing:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        # Only renter can confirm receipt
+        if existing["renter_id"] != current_user["id"]:
+            raise HTTPException(status_code=403, detail="Only the renter can confirm receipt")
+        # Must be in paid status
+        if existing["status"] != "paid":
+            raise HTTPException(status_code=400, detail="Booking must be paid first")
+        raise HTTPException(status_code=400, detail="Receipt already confirmed")
+    cache_invalidate(f"booked_dates:{booking['listing_id']}")
     
     # Calculate owner payout (total - platform fee)
     owner_payout = booking["total_price"] - booking["platform_fee"]
     
-    # Update owner's earnings
-    await db.users.update_one(
+    # Credit the owner's earnings; this also returns their Stripe details for the payout
+    owner = await db.users.find_one_and_update(
         {"id": booking["owner_id"]},
-        {"$inc": {"total_earnings": owner_payout, "pending_payout": owner_payout}}
+        {"$inc": {"total_earnings": owner_payout, "pending_payout": owner_payout}},
+        projection={"_id": 0, "stripe_account_id": 1, "stripe_onboarding_complete": 1},
+        return_document=ReturnDocument.AFTER
     )
     
-    # If owner has Stripe Connect, trigger payout
-    owner = await db.users.find_one({"id": booking["owner_id"]})
+    # If owner has Stripe Connect, queue the payout record and transfer after responding
     if owner and owner.get("stripe_account_id") and owner.get("stripe_onboarding_complete"):
-        try:
-            # Create transfer to connected account
-            transfer = stripe.Transfer.create(
-                amount=int(owner_payout * 100),  # Convert to cents
-                currency="aud",
-                destination=owner["stripe_account_id"],
-                description=f"Payout for booking {booking_id}"
-            )
-            logging.info(f"Stripe transfer created: {transfer.id}")
-        except Exception as e:
-            logging.error(f"Stripe transfer failed: {e}")
+        await db.payouts.update_one(
+            {"booking_id": booking_id},
+            {
+                # amount is the sum actually transferred, which retry_stalled_payouts re-sends
+                "$set": {
+                    "status": "queued",
+                    "amount": owner_payout,
+                    "queued_at": datetime.now(timezone.utc),
+                    "idempotency_key": f"payout-{booking_id}"
+                },
+                "$setOnInsert": {
+                    "id": new_id(),
+                    "owner_id": booking["owner_id"],
+                    "booking_id": booking_id,
+                    "created_at": datetime.now(timezone.utc)
+                }
+            },
+            upsert=True
+        )
+        background_tasks.add_task(send_owner_transfer, booking_id, owner_payout, owner["stripe_account_id"])
     
     return {"message": "Receipt confirmed, payment released to owner", "owner_payout": owner_payout}
 
@@ -936,39 +1015,52 @@ async def report_issue(
     current_user: dict = Depends(get_current_user)
 ):
     """Renter reports an issue with the booking"""
-    booking = await db.bookings.find_one({"id": booking_id})
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    
-    if booking["renter_id"] != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Only the renter can report issues")
-    
-    # Update booking with dispute
-    await db.bookings.update_one(
-        {"id": booking_id},
+    # Update booking with dispute; escrow can only be held if it was not
+    # already released by a concurrent receipt confirmation
+    booking = await db.bookings.find_one_and_update(
+        {
+            "id": booking_id,
+            "renter_id": current_user["id"],
+            "escrow_status": {"$ne": "released"}
+        },
         {
             "$set": {
                 "status": "disputed",
                 "escrow_status": "held",
                 "dispute_reason": issue,
-                "dispute_date": datetime.now(timezone.utc).isoformat()
+                "dispute_date": datetime.now(timezone.utc)
             }
-        }
+        },
+        projection={"_id": 0, "listing_id": 1}
     )
+    if not booking:
+        existing = await db.bookings.find_one({"id": booking_id}, {"_id": 0, "renter_id": 1})
+        if not existing:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        if existing["renter_id"] != current_user["id"]:
+            raise HTTPException(status_code=403, detail="Only the renter can report issues")
+        raise HTTPException(status_code=400, detail="Payment already released to owner")
+    cache_invalidate(f"booked_dates:{booking['listing_id']}")
     
     return {"message": "Issue reported. Our team will review and contact both parties."}
 
 @api_router.get("/bookings/listing/{listing_id}/dates")
 async def get_booked_dates(listing_id: str):
+    cache_key = f"booked_dates:{listing_id}"
+    if (body := cache_get(cache_key)) is not None:
+        return json_bytes_response(body)
+    
     bookings = await db.bookings.find(
         {
             "listing_id": listing_id,
             "status": {"$in": ["pending", "confirmed", "paid"]}
         },
         {"_id": 0, "start_date": 1, "end_date": 1}
-    ).to_list(100)
+    ).to_list(None)
     
-    return [{"start": b["start_date"], "end": b["end_date"]} for b in bookings]
+    body = orjson.dumps([{"start": b["start_date"], "end": b["end_date"]} for b in bookings])
+    cache_set(cache_key, body)
+    return json_bytes_response(body)
 
 # ============== REVIEWS ROUTES ==============
 
@@ -977,30 +1069,30 @@ async def create_review(
     review_data: ReviewCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    listing = await db.listings.find_one({"id": review_data.listing_id})
+    listing, booking, existing = await asyncio.gather(
+        db.listings.find_one({"id": review_data.listing_id}, {"_id": 1}),
+        # User must have a completed booking
+        db.bookings.find_one({
+            "listing_id": review_data.listing_id,
+            "renter_id": current_user["id"],
+            "status": {"$in": ["completed", "paid"]}
+        }, {"_id": 1}),
+        # and not have reviewed this listing already
+        db.reviews.find_one({
+            "listing_id": review_data.listing_id,
+            "reviewer_id": current_user["id"]
+        }, {"_id": 1})
+    )
     if not listing:
         raise HTTPException(status_code=404, detail="Listing not found")
     
-    # Check if user has a completed booking
-    booking = await db.bookings.find_one({
-        "listing_id": review_data.listing_id,
-        "renter_id": current_user["id"],
-        "status": {"$in": ["completed", "paid"]}
-    })
-    
     if not booking:
         raise HTTPException(status_code=400, detail="Must complete a rental to review")
     
-    # Check if already reviewed
-    existing = await db.reviews.find_one({
-        "listing_id": review_data.listing_id,
-        "reviewer_id": current_user["id"]
-    })
-    
     if existing:
         raise HTTPException(status_code=400, detail="Already reviewed this listing")
     
-    review_id = str(uuid.uuid4())
+    review_id = new_id()
     review_doc = {
         "id": review_id,
         "listing_id": review_data.listing_id,
@@ -1009,79 +1101,180 @@ async def create_review(
         "reviewer_avatar": current_user.get("avatar_url"),
         "rating": review_data.rating,
         "comment": review_data.comment,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     
     await db.reviews.insert_one(review_doc)
+    cache_invalidate(f"reviews:{review_data.listing_id}")
     
-    # Update listing rating
-    reviews = await db.reviews.find({"listing_id": review_data.listing_id}).to_list(1000)
-    avg_rating = sum(r["rating"] for r in reviews) / len(reviews)
+    # Update listing rating incrementally; listings reviewed before rating_sum
+    # existed derive it from their current average
     await db.listings.update_one(
         {"id": review_data.listing_id},
-        {"$set": {"avg_rating": round(avg_rating, 1), "review_count": len(reviews)}}
+        [
+            {"$set": {
+                "rating_sum": {"$add": [
+                    {"$ifNull": ["$rating_sum", {"$multiply": ["$avg_rating", "$review_count"]}]},
+                    review_data.rating
+                ]},
+                "review_count": {"$add": [{"$ifNull": ["$review_count", 0]}, 1]}
+            }},
+            {"$set": {"avg_rating": {"$round": [{"$divide": ["$rating_sum", "$review_count"]}, 1]}}}
+        ]
     )
     
     return ReviewResponse(**review_doc)
 
-@api_router.get("/reviews/listing/{listing_id}", response_model=List[ReviewResponse])
+# Hot list reads bypass response validation: the projection already yields the
+# response shape, so the docs go straight to orjson. `responses` keeps the schema.
+@api_router.get("/reviews/listing/{listing_id}", responses={200: {"model": List[ReviewResponse]}})
 async def get_listing_reviews(listing_id: str):
+    cache_key = f"reviews:{listing_id}"
+    if (body := cache_get(cache_key)) is not None:
+        return json_bytes_response(body)
+    
     reviews = await db.reviews.find(
         {"listing_id": listing_id},
-        {"_id": 0}
+        response_projection(ReviewResponse)
     ).sort("created_at", -1).to_list(100)
-    return [ReviewResponse(**r) for r in reviews]
+    body = orjson.dumps(reviews)
+    cache_set(cache_key, body)
+    return json_bytes_response(body)
 
 # ============== MESSAGES ROUTES ==============
 
-import re
+# Phone numbers (various formats)
+PHONE_PATTERNS = [
+    r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # 123-456-7890
+    r'\b\(\d{3}\)\s*\d{3}[-.\s]?\d{4}\b',   # (123) 456-7890
+    r'\b\+\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}\b',  # +1 123 456 7890
+    r'\b\d{10,11}\b',  # 1234567890
+]
+_ANY_PHONE = "|".join(PHONE_PATTERNS)
+
+# Email addresses
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+
+# Social media handles and keywords
+SOCIAL_HANDLE_PATTERN = r'@[A-Za-z0-9_]{3,}'  # @username
+SOCIAL_KEYWORD_PATTERNS = [
+    r'\b(?:whatsapp|telegram|signal|venmo|cashapp|paypal|zelle)\b',
+    r'\b(?:instagram|facebook|fb|insta|snap|snapchat|tiktok)\b',
+    r'\b(?:call|text|dm)\s*(?:me|us)\b',
+]
+
+def _unless(patterns: list[str], char: str) -> str:
+    """Regex for one `char` that doesn't start a match of any of `patterns`"""
+    return rf'(?:(?!{"|".join(patterns)}){char})' if patterns else char
+
+# The filter used to run each pattern over the whole message in turn: phones,
+# email, URLs, then social. A single pass takes the leftmost match instead, so
+# each pattern below is kept from consuming anything an earlier one would have
+# hidden, and the social patterns fall back to hiding their own match whenever
+# no earlier pattern does.
+def _guard_phone(i: int, pattern: str) -> str:
+    """Phone pattern `i`, kept off digits an earlier phone pattern would hide;
+    its plain lookahead rejects most positions before the costlier guarded match"""
+    if not i:
+        return pattern
+    guarded = pattern.replace(r'\d', _unless(PHONE_PATTERNS[:i], r'\d'))
+    return f'(?={pattern}){guarded}'
+
+_PHONES = [_guard_phone(i, pattern) for i, pattern in enumerate(PHONE_PATTERNS)]
+_EMAIL = (
+    # The plain lookahead rules out most words before the guarded match runs
+    rf"\b(?=[A-Za-z0-9._%+-]+@){_unless(PHONE_PATTERNS, '[A-Za-z0-9._%+-]')}+@"
+    rf"{_unless(PHONE_PATTERNS, '[A-Za-z0-9.-]')}+\.[A-Z|a-z]{{2,}}\b"
+)
+# URLs, ending after an embedded phone number so it is hidden with the link
+_URL_CHAR = _unless(PHONE_PATTERNS, r'[^\s]')
+URL_PATTERN = rf'https?://(?:{_URL_CHAR}+(?:{_ANY_PHONE})?|{_ANY_PHONE})'
+
+# Contact-info patterns as (kind, regex), in priority order
+CONTACT_PATTERNS = [
+    *(("phone", pattern) for pattern in _PHONES),
+    ("email", _EMAIL),
+    ("url", URL_PATTERN),
+    ("social", rf'@(?!{_ANY_PHONE}|{_EMAIL}|{URL_PATTERN}){_unless([URL_PATTERN], "[A-Za-z0-9_]")}{{3,}}'),
+    *(("social", pattern) for pattern in SOCIAL_KEYWORD_PATTERNS[:2]),
+    ("social", rf'\b(?:call|text|dm)\s*(?!{_EMAIL})(?:me|us)\b'),
+]
+
+CONTACT_REPLACEMENTS = {
+    "phone": "[phone hidden]",
+    "email": "[email hidden]",
+    "url": "[link hidden]",
+    "social": "[removed]",
+}
+
+# All patterns fused into one alternation so each message is scanned once
+_CONTACT_GROUP_REPLACEMENTS = {
+    f"{kind}{i}": CONTACT_REPLACEMENTS[kind] for i, (kind, _) in enumerate(CONTACT_PATTERNS)
+}
+CONTACT_RE = re.compile(
+    "|".join(f"(?P<{kind}{i}>{pattern})" for i, (kind, pattern) in enumerate(CONTACT_PATTERNS)),
+    re.IGNORECASE
+)
+
+# re's IGNORECASE also matches these to "i"; casefold() alone does not
+_CASEFOLD_FIXUPS = {0x130: "i", 0x131: "i"}
+
+def _fold(text: str) -> str:
+    return text.translate(_CASEFOLD_FIXUPS).casefold()
+
+# Every pattern needs a digit, an "@", "http" or one of these keywords
+CONTACT_HINTS = (
+    "http", "whatsapp", "telegram", "signal", "venmo", "cashapp", "paypal", "zelle",
+    "insta", "facebook", "fb", "snap", "tiktok", "call", "text", "dm",
+)
+_DIGIT_RE = re.compile(r'\d')
+
+def _may_contain_contact(text: str, folded: str) -> bool:
+    """Cheap prefilter so plain chat messages skip the regex pass entirely"""
+    if "@" in text or _DIGIT_RE.search(text):
+        return True
+    return any(hint in folded for hint in CONTACT_HINTS)
+
+# RE2 cannot run the lookaheads above, but it can screen messages in linear
+# time before the backtracking pass. Its \b, \d and \s are ASCII-only, so the
+# screen drops \b and widens \d/\s to keep it a superset of CONTACT_RE.
+_RE2_SPACE_CHARS = r'\s\x{0b}\x{1c}-\x{1f}\x{85}\p{Z}'
+
+def _re2_superset(pattern: str) -> str:
+    pattern = pattern.replace(r'\b', '').replace(r'\d', r'\p{Nd}')
+    pattern = pattern.replace(r'\s', f'[{_RE2_SPACE_CHARS}]')
+    return pattern.replace(f'[-.[{_RE2_SPACE_CHARS}]]', f'[-.{_RE2_SPACE_CHARS}]')
+
+CONTACT_SCREEN_RE = None
+if re2 is not None:
+    CONTACT_SCREEN_RE = re2.compile("|".join(_re2_superset(pattern) for pattern in [
+        *PHONE_PATTERNS,
+        EMAIL_PATTERN,
+        r'https?://',
+        SOCIAL_HANDLE_PATTERN,
+        *SOCIAL_KEYWORD_PATTERNS,
+    ]))
+
+def _replace_contact(match: re.Match) -> str:
+    return _CONTACT_GROUP_REPLACEMENTS[match.lastgroup]
 
 def filter_contact_info(text: str) -> tuple[str, bool]:
     """Filter out phone numbers, emails, and social media handles. Returns (filtered_text, was_filtered)"""
-    original = text
-    
-    # Phone numbers (various formats)
-    phone_patterns = [
-        r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',  # 123-456-7890
-        r'\b\(\d{3}\)\s*\d{3}[-.\s]?\d{4}\b',   # (123) 456-7890
-        r'\b\+\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}\b',  # +1 123 456 7890
-        r'\b\d{10,11}\b',  # 1234567890
-    ]
-    
-    # Email addresses
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    
-    # Social media handles and keywords
-    social_patterns = [
-        r'@[A-Za-z0-9_]{3,}',  # @username
-        r'\b(whatsapp|telegram|signal|venmo|cashapp|paypal|zelle)\b',
-        r'\b(instagram|facebook|fb|insta|snap|snapchat|tiktok)\b',
-        r'\b(call|text|dm)\s*(me|us)\b',
-    ]
-    
-    # URLs
-    url_pattern = r'https?://[^\s]+'
-    
-    filtered = text
-    
-    for pattern in phone_patterns:
-        filtered = re.sub(pattern, '[phone hidden]', filtered, flags=re.IGNORECASE)
-    
-    filtered = re.sub(email_pattern, '[email hidden]', filtered, flags=re.IGNORECASE)
-    filtered = re.sub(url_pattern, '[link hidden]', filtered, flags=re.IGNORECASE)
-    
-    for pattern in social_patterns:
-        filtered = re.sub(pattern, '[removed]', filtered, flags=re.IGNORECASE)
-    
-    was_filtered = filtered != original
-    return filtered, was_filtered
+    folded = _fold(text)
+    if not _may_contain_contact(text, folded):
+        return text, False
+    # RE2 folds case more narrowly than re, so it screens the folded text
+    if CONTACT_SCREEN_RE is not None and not CONTACT_SCREEN_RE.search(folded):
+        return text, False
+    filtered, count = CONTACT_RE.subn(_replace_contact, text)
+    return filtered, count > 0
 
 @api_router.post("/messages", response_model=MessageResponse)
 async def send_message(
     message_data: MessageCreate,
     current_user: dict = Depends(get_current_user)
 ):
-    recipient = await db.users.find_one({"id": message_data.recipient_id})
+    recipient = await db.users.find_one({"id": message_data.recipient_id}, {"_id": 1})
     if not recipient:
         raise HTTPException(status_code=404, detail="Recipient not found")
     
@@ -1095,7 +1288,7 @@ async def send_message(
                 {"renter_id": current_user["id"], "owner_id": message_data.recipient_id},
                 {"renter_id": message_data.recipient_id, "owner_id": current_user["id"]}
             ]
-        })
+        }, {"_id": 1})
         has_paid_booking = paid_booking is not None
     
     # Filter contact info if no paid booking
@@ -1104,7 +1297,7 @@ async def send_message(
     if not has_paid_booking:
         content, was_filtered = filter_contact_info(content)
     
-    message_id = str(uuid.uuid4())
+    message_id = new_id()
     message_doc = {
         "id": message_id,
         "sender_id": current_user["id"],
@@ -1115,70 +1308,110 @@ async def send_message(
         "listing_id": message_data.listing_id,
         "is_read": False,
         "was_filtered": was_filtered,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     
     await db.messages.insert_one(message_doc)
+    
+    # Keep both sides' conversation summaries current; only the recipient gains an unread
+    summary = {
+        "last_message": content,
+        "last_message_time": message_doc["created_at"],
+        "listing_id": message_data.listing_id
+    }
+    await asyncio.gather(
+        db.conversation_meta.update_one(
+            {"user_id": message_data.recipient_id, "partner_id": current_user["id"]},
+            {"$set": summary, "$inc": {"unread": 1}},
+            upsert=True
+        ),
+        db.conversation_meta.update_one(
+            {"user_id": current_user["id"], "partner_id": message_data.recipient_id},
+            {"$set": summary, "$setOnInsert": {"unread": 0}},
+            upsert=True
+        )
+    )
     return MessageResponse(**message_doc)
 
-@api_router.get("/messages/conversations", response_model=List[ConversationResponse])
+@api_router.get("/messages/conversations", responses={200: {"model": List[ConversationResponse]}})
 async def get_conversations(current_user: dict = Depends(get_current_user)):
-    # Get all messages involving the current user
-    messages = await db.messages.find(
-        {"$or": [
-            {"sender_id": current_user["id"]},
-            {"recipient_id": current_user["id"]}
-        ]},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(1000)
-    
-    # Group by conversation partner
-    conversations = {}
-    for msg in messages:
-        partner_id = msg["recipient_id"] if msg["sender_id"] == current_user["id"] else msg["sender_id"]
-        
-        if partner_id not in conversations:
-            partner = await db.users.find_one({"id": partner_id}, {"_id": 0, "password": 0})
-            listing = None
-            if msg.get("listing_id"):
-                listing = await db.listings.find_one({"id": msg["listing_id"]}, {"_id": 0})
-            
-            conversations[partner_id] = {
-                "user_id": partner_id,
-                "user_name": partner["name"] if partner else "Unknown",
-                "user_avatar": partner.get("avatar_url") if partner else None,
-                "last_message": msg["content"],
-                "last_message_time": msg["created_at"],
-                "unread_count": 0,
-                "listing_id": msg.get("listing_id"),
-                "listing_title": listing["title"] if listing else None
-            }
-        
-        if msg["recipient_id"] == current_user["id"] and not msg["is_read"]:
-            conversations[partner_id]["unread_count"] += 1
-    
-    return [ConversationResponse(**c) for c in conversations.values()]
+    pipeline = [
+        # Per-partner summaries maintained by send_message
+        {"$match": {"user_id": current_user["id"]}},
+        {"$sort": {"last_message_time": -1}},
+        {"$lookup": {
+            "from": "users",
+            "localField": "partner_id",
+            "foreignField": "id",
+            "pipeline": [{"$project": {"_id": 0, "name": 1, "avatar_url": 1}}],
+            "as": "partner"
+        }},
+        {"$lookup": {
+            "from": "listings",
+            "localField": "listing_id",
+            "foreignField": "id",
+            "pipeline": [{"$project": {"_id": 0, "title": 1}}],
+            "as": "listing"
+        }},
+        {"$project": {
+            "_id": 0,
+            "user_id": "$partner_id",
+            "user_name": {"$ifNull": [{"$first": "$partner.name"}, "Unknown"]},
+            "user_avatar": {"$ifNull": [{"$first": "$partner.avatar_url"}, None]},
+            "last_message": 1,
+            "last_message_time": 1,
+            "unread_count": "$unread",
+            "listing_id": 1,
+            "listing_title": {"$ifNull": [{"$first": "$listing.title"}, None]}
+        }}
+    ]
+    conversations = await db.conversation_meta.aggregate(pipeline).to_list(None)
+    return ORJSONResponse(conversations)
 
-@api_router.get("/messages/{user_id}", response_model=List[MessageResponse])
+@api_router.get("/messages/{user_id}", responses={200: {"model": List[MessageResponse]}})
 async def get_messages_with_user(
     user_id: str,
     current_user: dict = Depends(get_current_user)
 ):
-    messages = await db.messages.find(
-        {"$or": [
-            {"sender_id": current_user["id"], "recipient_id": user_id},
-            {"sender_id": user_id, "recipient_id": current_user["id"]}
-        ]},
-        {"_id": 0}
-    ).sort("created_at", 1).to_list(100)
-    
-    # Mark messages as read
-    await db.messages.update_many(
-        {"sender_id": user_id, "recipient_id": current_user["id"], "is_read": False},
-        {"$set": {"is_read": True}}
+    # Taken before the query, so a message arriving mid-request stays unread until shown
+    seen_at = datetime.now(timezone.utc)
+    messages, partner_meta = await asyncio.gather(
+        db.messages.find(
+            {"$or": [
+                {"sender_id": current_user["id"], "recipient_id": user_id},
+                {"sender_id": user_id, "recipient_id": current_user["id"]}
+            ]},
+            response_projection(MessageResponse)
+        ).sort("created_at", 1).to_list(100),
+        db.conversation_meta.find_one(
+            {"user_id": user_id, "partner_id": current_user["id"]},
+            {"_id": 0, "last_seen_at": 1}
+        )
+    )
+    if not messages:
+        return ORJSONResponse(messages)
+    
+    # Mark the whole conversation read with one write, including messages past
+    # the 100 returned, and derive is_read from last_seen_at on reads
+    my_meta = await db.conversation_meta.find_one_and_update(
+        {"user_id": current_user["id"], "partner_id": user_id},
+        {"$set": {"unread": 0, "last_seen_at": seen_at}},
+        projection={"_id": 0, "last_seen_at": 1},
+        return_document=ReturnDocument.BEFORE
     )
     
-    return [MessageResponse(**m) for m in messages]
+    # Messages marked read before last_seen_at existed keep their stored flag
+    seen_by = {
+        current_user["id"]: (partner_meta or {}).get("last_seen_at"),
+        user_id: (my_meta or {}).get("last_seen_at")
+    }
+    for m in messages:
+        last_seen = seen_by[m["sender_id"]]
+        m["is_read"] = m.get("is_read", False) or (
+            last_seen is not None and as_datetime(m["created_at"]) <= as_datetime(last_seen)
+        )
+    
+    return ORJSONResponse(messages)
 
 # ============== PAYMENT ROUTES ==============
 
@@ -1245,10 +1478,10 @@ async def create_checkout(
                 },
             }
         
-        session = stripe.checkout.Session.create(**session_params)
+        session = await asyncio.to_thread(stripe.checkout.Session.create, **session_params)
         
         # Create payment transaction record
-        transaction_id = str(uuid.uuid4())
+        transaction_id = new_id()
         transaction_doc = {
             "id": transaction_id,
             "session_id": session.id,
@@ -1263,7 +1496,7 @@ async def create_checkout(
             "auto_payout": owner_stripe_account is not None,
             "status": "initiated",
             "payment_status": "pending",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
             "metadata": {
                 "booking_id": booking["id"],
                 "listing_id": booking["listing_id"]
@@ -1293,7 +1526,7 @@ async def get_payment_status(
     
     try:
         # Check Stripe session status directly
-        session = stripe.checkout.Session.retrieve(session_id)
+        session = await asyncio.to_thread(stripe.checkout.Session.retrieve, session_id)
         
         payment_status = "pending"
         if session.payment_status == "paid":
@@ -1303,17 +1536,18 @@ async def get_payment_status(
         
         # Update transaction and booking if payment successful
         if payment_status == "paid" and transaction["payment_status"] != "paid":
-            await db.payment_transactions.update_one(
-                {"session_id": session_id},
-                {"$set": {
-                    "status": "completed",
-                    "payment_status": "paid"
-                }}
-            )
-            
-            await db.bookings.update_one(
-                {"id": transaction["booking_id"]},
-                {"$set": {"status": "paid", "escrow_status": "held"}}
+            await asyncio.gather(
+                db.payment_transactions.update_one(
+                    {"session_id": session_id},
+                    {"$set": {
+                        "status": "completed",
+                        "payment_status": "paid"
+                    }}
+                ),
+                db.bookings.update_one(
+                    {"id": transaction["booking_id"]},
+                    {"$set": {"status": "paid", "escrow_status": "held"}}
+                )
             )
             
             # DON'T credit owner yet - money is held in escrow
@@ -1349,32 +1583,36 @@ async def stripe_webhook(request: Request):
             
             transaction = await db.payment_transactions.find_one({"session_id": session_id})
             if transaction and transaction["payment_status"] != "paid":
-                await db.payment_transactions.update_one(
-                    {"session_id": session_id},
-                    {"$set": {
-                        "status": "completed",
-                        "payment_status": "paid"
-                    }}
-                )
-                
-                await db.bookings.update_one(
-                    {"id": transaction["booking_id"]},
-                    {"$set": {"status": "paid", "escrow_status": "held"}}
+                _, _, booking = await asyncio.gather(
+                    db.payment_transactions.update_one(
+                        {"session_id": session_id},
+                        {"$set": {
+                            "status": "completed",
+                            "payment_status": "paid"
+                        }}
+                    ),
+                    db.bookings.update_one(
+                        {"id": transaction["booking_id"]},
+                        {"$set": {"status": "paid", "escrow_status": "held"}}
+                    ),
+                    db.bookings.find_one(
+                        {"id": transaction["booking_id"]},
+                        {"_id": 0, "id": 1, "owner_id": 1}
+                    )
                 )
                 
                 # DON'T credit owner yet - money is held in escrow
                 # Owner gets paid when renter confirms receipt
-                booking = await db.bookings.find_one({"id": transaction["booking_id"]})
                 if booking:
                     logging.info(f"Webhook: Payment received for booking {transaction['booking_id']} - funds held in escrow")
                     # Create payout record
                     await db.payouts.insert_one({
-                        "id": str(uuid.uuid4()),
+                        "id": new_id(),
                         "owner_id": booking["owner_id"],
                         "booking_id": booking["id"],
-                        "amount": owner_amount,
+                        "amount": transaction["owner_amount"],
                         "status": "pending",
-                        "created_at": datetime.now(timezone.utc).isoformat()
+                        "created_at": datetime.now(timezone.utc)
                     })
         
         return {"status": "ok"}
@@ -1388,29 +1626,60 @@ class ImageUpload(BaseModel):
     image_data: str  # Base64 encoded image
     filename: str
 
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+# Longest base64 payload that can decode to MAX_IMAGE_BYTES
+MAX_IMAGE_B64_CHARS = (MAX_IMAGE_BYTES + 2) // 3 * 4
+# Upper bound for the whole JSON upload request (data URL header, filename),
+# allowing for base64 wrapped at 76 chars with CRLFs, which JSON escapes to 4 bytes
+MAX_IMAGE_REQUEST_BYTES = MAX_IMAGE_B64_CHARS * 80 // 76 + 64 * 1024
+
+def parse_data_url(data: str) -> tuple[str, str]:
+    """Split a base64 data URL into (content_type, base64_payload)"""
+    if ',' in data:
+        header, data = data.split(',', 1)
+        content_type = header.split(':')[1].split(';')[0] if ':' in header else 'image/jpeg'
+    else:
+        content_type = 'image/jpeg'
+    return content_type, data
+
 @api_router.post("/upload/image")
 async def upload_image(
     upload: ImageUpload,
     current_user: dict = Depends(get_current_user)
 ):
-    import base64
+    content_type, encoded = parse_data_url(upload.image_data)
     
-    # Validate image size (max 5MB)
-    try:
-        image_bytes = base64.b64decode(upload.image_data.split(',')[-1])
-        if len(image_bytes) > 5 * 1024 * 1024:
+    # Reject oversized payloads before spending time decoding them. b64decode
+    # skips line breaks, so only a wrapped payload's base64 characters count.
+    if len(encoded) > MAX_IMAGE_B64_CHARS:
+        encoded = "".join(encoded.split())
+        if len(encoded) > MAX_IMAGE_B64_CHARS:
             raise HTTPException(status_code=400, detail="Image too large (max 5MB)")
-    except Exception as e:
+    
+    try:
+        image_bytes = base64.b64decode(encoded)
+    except Exception:
         raise HTTPException(status_code=400, detail="Invalid image data")
     
-    # Store image in database
-    image_id = str(uuid.uuid4())
+    # Validate image size (max 5MB)
+    if len(image_bytes) > MAX_IMAGE_BYTES:
+        raise HTTPException(status_code=400, detail="Image too large (max 5MB)")
+    
+    # Store decoded bytes in GridFS and keep only metadata in the images collection
+    image_id = new_id()
+    file_id = await images_fs.upload_from_stream(
+        upload.filename,
+        image_bytes,
+        metadata={"image_id": image_id, "content_type": content_type}
+    )
     image_doc = {
         "id": image_id,
         "user_id": current_user["id"],
         "filename": upload.filename,
-        "data": upload.image_data,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "content_type": content_type,
+        "size": len(image_bytes),
+        "file_id": file_id,
+        "created_at": datetime.now(timezone.utc)
     }
     
     await db.images.insert_one(image_doc)
@@ -1418,25 +1687,36 @@ async def upload_image(
     # Return URL to access image
     return {"image_id": image_id, "url": f"/api/images/{image_id}"}
 
+# Image IDs are never reused, so clients and CDNs may cache them forever
+IMAGE_CACHE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
 @api_router.get("/images/{image_id}")
 async def get_image(image_id: str):
-    from fastapi.responses import Response
-    import base64
-    
-    image = await db.images.find_one({"id": image_id})
+    image = await db.images.find_one({"id": image_id}, {"_id": 0})
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
     
-    # Extract base64 data
-    data = image["data"]
-    if ',' in data:
-        header, data = data.split(',', 1)
-        content_type = header.split(':')[1].split(';')[0] if ':' in header else 'image/jpeg'
-    else:
-        content_type = 'image/jpeg'
+    # Images uploaded before GridFS storage keep their base64 data inline
+    # until migrate_images.py moves them; reads never write
+    if "file_id" not in image:
+        content_type, data = parse_data_url(image["data"])
+        try:
+            image_bytes = base64.b64decode(data)
+        except binascii.Error:
+            raise HTTPException(status_code=404, detail="Image not found")
+        return Response(content=image_bytes, media_type=content_type, headers=IMAGE_CACHE_HEADERS)
+    
+    grid_out = await images_fs.open_download_stream(image["file_id"])
+    
+    async def iter_chunks():
+        while chunk := await grid_out.readchunk():
+            yield chunk
     
-    image_bytes = base64.b64decode(data)
-    return Response(content=image_bytes, media_type=content_type)
+    return StreamingResponse(
+        iter_chunks(),
+        media_type=image["content_type"],
+        headers={"Content-Length": str(image["size"]), **IMAGE_CACHE_HEADERS}
+    )
 
 # ============== PAYOUTS ==============
 
@@ -1446,19 +1726,22 @@ async def get_my_payouts(current_user: dict = Depends(get_current_user)):
         {"owner_id": current_user["id"]},
         {"_id": 0}
     ).sort("created_at", -1).to_list(100)
-    return payouts
+    return ORJSONResponse(payouts)
 
 @api_router.get("/payouts/summary")
 async def get_payout_summary(current_user: dict = Depends(get_current_user)):
-    user = await db.users.find_one({"id": current_user["id"]}, {"_id": 0})
-    
-    # Get paid out amount
-    paid_payouts = await db.payouts.find(
-        {"owner_id": current_user["id"], "status": "paid"},
-        {"_id": 0}
-    ).to_list(1000)
-    
-    paid_amount = sum(p.get("amount", 0) for p in paid_payouts)
+    user, paid = await asyncio.gather(
+        db.users.find_one(
+            {"id": current_user["id"]},
+            {"_id": 0, "total_earnings": 1, "pending_payout": 1}
+        ),
+        # Sum paid payouts on the server rather than loading them
+        db.payouts.aggregate([
+            {"$match": {"owner_id": current_user["id"], "status": "paid"}},
+            {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+        ]).to_list(1)
+    )
+    paid_amount = paid[0]["total"] if paid else 0
     
     return {
         "total_earnings": user.get("total_earnings", 0),
@@ -1468,20 +1751,20 @@ async def get_payout_summary(current_user: dict = Depends(get_current_user)):
 
 @api_router.post("/payouts/request")
 async def request_payout(current_user: dict = Depends(get_current_user)):
-    user = await db.users.find_one({"id": current_user["id"]})
+    user = await db.users.find_one({"id": current_user["id"]}, {"pending_payout": 1})
     pending = user.get("pending_payout", 0)
     
     if pending < 10:
         raise HTTPException(status_code=400, detail="Minimum payout is $10")
     
     # Create payout request
-    payout_request_id = str(uuid.uuid4())
+    payout_request_id = new_id()
     await db.payout_requests.insert_one({
         "id": payout_request_id,
         "user_id": current_user["id"],
         "amount": pending,
         "status": "pending",
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc)
     })
     
     # Note: In production, this would trigger actual payout via Stripe Connect
@@ -1553,9 +1836,16 @@ CATEGORIES = [
     {"id": "other", "name": "Other", "icon": "package"}
 ]
 
+# Constant, so serialize once at import instead of per request
+CATEGORIES_JSON = orjson.dumps(CATEGORIES)
+
 @api_router.get("/categories")
 async def get_categories():
-    return CATEGORIES
+    return Response(
+        content=CATEGORIES_JSON,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
 
 # ============== ROOT ==============
 
@@ -1566,6 +1856,15 @@ async def root():
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    # Refuse oversized image uploads before the body is read and parsed
+    if request.url.path == "/api/upload/image":
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_IMAGE_REQUEST_BYTES:
+            return ORJSONResponse(status_code=413, content={"detail": "Image too large (max 5MB)"})
+    return await call_next(request)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -1578,7 +1877,7 @@ app.add_middleware(
 if STATIC_DIR.exists():
     app.mount("/static", StaticFiles(directory=STATIC_DIR / "static"), name="static")
     
-    @app.get("/{full_path:path}")
+    @app.api_route("/{full_path:path}", methods=["GET", "HEAD"])
     async def serve_frontend(full_path: str):
         if full_path.startswith("api"):
             raise HTTPException(status_code=404, detail="Not found")
@@ -1597,6 +1896,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Blocking SDK calls (Stripe, Twilio) run via asyncio.to_thread; cap how many
+# can be in flight at once
+BLOCKING_IO_WORKERS = int(os.environ.get('BLOCKING_IO_WORKERS', '32'))
+
+@app.on_event("startup")
+async def configure_blocking_executor():
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io")
+    )
+
+@app.on_event("startup")
+async def create_indexes():
+    # Expired verification codes are removed by MongoDB's TTL monitor
+    await db.verification_codes.create_index("expires_at", expireAfterSeconds=0)
+    # Covers the booked-dates lookup so it never touches the documents
+    await db.bookings.create_index(
+        [("listing_id", 1), ("status", 1), ("start_date", 1), ("end_date", 1)],
+        name="booked_dates_cov"
+    )
+    await db.messages.create_index([("sender_id", 1), ("recipient_id", 1), ("created_at", -1)])
+    await db.messages.create_index([("recipient_id", 1), ("sender_id", 1), ("created_at", -1)])
+    await db.reviews.create_index([("listing_id", 1), ("reviewer_id", 1)])
+    await db.payouts.create_index([("owner_id", 1), ("status", 1), ("created_at", -1)])
+    await db.payouts.create_index([("status", 1), ("queued_at", 1)])
+    try:
+        await db.payment_transactions.create_index("session_id", unique=True)
+    except DuplicateKeyError as e:
+        # Older data may hold duplicate sessions; serve unindexed rather than fail to boot
+        logging.error(f"payment_transactions.session_id index not built, duplicate session ids must be removed first: {e}")
+    await db.conversation_meta.create_index([("user_id", 1), ("partner_id", 1)], unique=True)
+    await db.conversation_meta.create_index([("user_id", 1), ("last_message_time", -1)])
+
+@app.on_event("startup")
+async def start_payout_retries():
+    app.state.payout_retries = asyncio.create_task(payout_retry_loop())
+
+@app.on_event("shutdown")
+async def stop_payout_retries():
+    app.state.payout_retries.cancel()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
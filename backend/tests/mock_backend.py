@@ -0,0 +1,179 @@
+"""
+In-process stand-in for the RentAll API, used by `pytest --mock`
+
+Registers `responses` callbacks for the auth, listing and booking routes the
+pricing suites call, so they run without a live backend. Bookings are priced by
+the same pricing.price_booking the server's create_booking uses; this module
+only stubs HTTP and storage.
+"""
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import responses
+
+from pricing import PricingError, price_booking
+
+# ListingBase defaults for fields a payload may omit
+LISTING_DEFAULTS = {
+    "price_per_hour": None,
+    "price_per_day": None,
+    "price_per_week": None,
+    "images": [],
+    "damage_deposit": 0.0,
+    "min_rental_hours": 1,
+    "min_rental_days": 1,
+    "max_rental_days": 30,
+    "surge_enabled": False,
+    "surge_percentage": 20.0,
+    "surge_weekends": True,
+    "surge_dates": [],
+    "discount_weekly": 0.0,
+    "discount_monthly": 0.0,
+    "discount_quarterly": 0.0,
+}
+
+
+class MockBackend:
+    """In-memory users, listings and bookings behind the API routes the test suites use"""
+
+    def __init__(self, api):
+        self.api = api
+        self.users = {}     # email -> user
+        self.tokens = {}    # token -> user
+        self.listings = {}
+        self.bookings = {}
+
+    def register(self, mock):
+        api = re.escape(self.api)
+        mock.add(responses.GET, f"{self.api}/", json={"message": "RentAll API", "version": "1.0.0"})
+        mock.add_callback(responses.POST, f"{self.api}/auth/register", callback=self.auth_register)
+        mock.add_callback(responses.POST, f"{self.api}/auth/login", callback=self.auth_login)
+        mock.add_callback(responses.POST, f"{self.api}/listings", callback=self.create_listing)
+        mock.add_callback(responses.GET, re.compile(rf"{api}/listings/[\w-]+$"), callback=self.get_listing)
+        mock.add_callback(responses.POST, f"{self.api}/bookings", callback=self.create_booking)
+        mock.add_callback(responses.GET, f"{self.api}/bookings/my", callback=self.my_bookings)
+        mock.add_callback(responses.GET, re.compile(rf"{api}/bookings/(?!my$)[\w-]+$"), callback=self.get_booking)
+
+    # ============== HELPERS ==============
+
+    @staticmethod
+    def reply(status, body):
+        return status, {"Content-Type": "application/json"}, orjson.dumps(body)
+
+    def current_user(self, request):
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        return self.tokens.get(token)
+
+    def issue_token(self, user):
+        token = uuid.uuid4().hex
+        self.tokens[token] = user
+        return self.reply(200, {"token": token, "user": {k: v for k, v in user.items() if k != "password"}})
+
+    # ============== ROUTES ==============
+
+    def auth_register(self, request):
+        data = orjson.loads(request.body)
+        if data["email"] in self.users:
+            return self.reply(400, {"detail": "Email already registered"})
+        user = {"id": str(uuid.uuid4()), "email": data["email"], "name": data["name"], "password": data["password"]}
+        self.users[data["email"]] = user
+        return self.issue_token(user)
+
+    def auth_login(self, request):
+        data = orjson.loads(request.body)
+        user = self.users.get(data["email"])
+        if not user or user["password"] != data["password"]:
+            return self.reply(401, {"detail": "Invalid credentials"})
+        return self.issue_token(user)
+
+    def create_listing(self, request):
+        user = self.current_user(request)
+        if not user:
+            return self.reply(401, {"detail": "Not authenticated"})
+        listing = {
+            "id": str(uuid.uuid4()),
+            "owner_id": user["id"],
+            "owner_name": user["name"],
+            **LISTING_DEFAULTS,
+            **orjson.loads(request.body),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "avg_rating": 0.0,
+            "review_count": 0,
+            "is_available": True
+        }
+        self.listings[listing["id"]] = listing
+        return self.reply(200, listing)
+
+    def get_listing(self, request):
+        listing = self.listings.get(request.path_url.rsplit("/", 1)[-1])
+        if not listing:
+            return self.reply(404, {"detail": "Listing not found"})
+        return self.reply(200, listing)
+
+    def create_booking(self, request):
+        user = self.current_user(request)
+        if not user:
+            return self.reply(401, {"detail": "Not authenticated"})
+        data = orjson.loads(request.body)
+        listing = self.listings.get(data["listing_id"])
+        if not listing:
+            return self.reply(404, {"detail": "Listing not found"})
+        if listing["owner_id"] == user["id"]:
+            return self.reply(400, {"detail": "Cannot book your own listing"})
+
+        start_date = datetime.fromisoformat(data["start_date"])
+        end_date = datetime.fromisoformat(data["end_date"])
+        if end_date < start_date:
+            return self.reply(400, {"detail": "End date must be after start date"})
+        if any(b["listing_id"] == listing["id"] and b["start_date"] <= data["end_date"] and b["end_date"] >= data["start_date"]
+               for b in self.bookings.values()):
+            return self.reply(400, {"detail": "Dates not available"})
+
+        duration_type = data.get("duration_type") or "daily"
+        try:
+            pricing = price_booking(listing, start_date, end_date, duration_type, data.get("hours"))
+        except PricingError as e:
+            return self.reply(400, {"detail": str(e)})
+
+        booking = {
+            "id": str(uuid.uuid4()),
+            "listing_id": listing["id"],
+            "listing_title": listing["title"],
+            "listing_image": listing["images"][0] if listing["images"] else None,
+            "renter_id": user["id"],
+            "renter_name": user["name"],
+            "owner_id": listing["owner_id"],
+            "start_date": data["start_date"],
+            "end_date": data["end_date"],
+            "duration_type": duration_type,
+            "hours": data.get("hours"),
+            **pricing,
+            "status": "pending",
+            "escrow_status": "pending",
+            "receipt_confirmed": False,
+            "receipt_confirmed_at": None,
+            "auto_release_date": (end_date + timedelta(days=3)).isoformat(),
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        self.bookings[booking["id"]] = booking
+        return self.reply(200, booking)
+
+    def my_bookings(self, request):
+        user = self.current_user(request)
+        if not user:
+            return self.reply(401, {"detail": "Not authenticated"})
+        mine = [b for b in self.bookings.values() if b["renter_id"] == user["id"]]
+        return self.reply(200, sorted(mine, key=lambda b: b["created_at"], reverse=True))
+
+    def get_booking(self, request):
+        user = self.current_user(request)
+        if not user:
+            return self.reply(401, {"detail": "Not authenticated"})
+        booking = self.bookings.get(request.path_url.rsplit("/", 1)[-1])
+        if not booking:
+            return self.reply(404, {"detail": "Booking not found"})
+        if user["id"] not in (booking["renter_id"], booking["owner_id"]):
+            return self.reply(403, {"detail": "Not authorized"})
+        return self.reply(200, booking)
@@ -0,0 +1,41 @@
+"""
+Test suite for the message contact-info filter
+Tests: the single-pass filter_contact_info hides at least what the original
+one-pattern-at-a-time filter did
+"""
+import pytest
+
+# Pure server logic, so it runs under `pytest --mock` too
+pytestmark = pytest.mark.mockable
+
+# (message, output of the original sequential filter)
+BASELINE_CASES = [
+    ("x@4http://", "x[removed]://"),
+    ("A@http://", "A[removed]://"),
+    ("+1 555 123 4567", "+1 [phone hidden]"),
+    ("call me@x.com", "call [email hidden]"),
+    ("call me@5551234567.https://.com555-", "[removed]@[phone hidden].[link hidden]"),
+    ("x+15551234567 555 4567555", "x[phone hidden] [phone hidden]"),
+    ("https://insta+1.5551234567", "[link hidden] hidden]"),
+    ("@5551234567", "@[phone hidden]"),
+    ("@john_doe", "[removed]"),
+    ("john.doe@gmail.com", "[email hidden]"),
+    ("see https://example.com/item/123", "see [link hidden]"),
+    ("call me at 555-123-4567", "[removed] at [phone hidden]"),
+    ("Is it free on the 12th?", "Is it free on the 12th?"),
+]
+
+
+def exposed(text):
+    """Characters of contact info left visible: every "@" and digit"""
+    return sum(c == "@" or c.isdigit() for c in text)
+
+
+class TestContactFilter:
+    """The fused regex never reveals more than the original filter"""
+
+    @pytest.mark.parametrize("message, baseline", BASELINE_CASES)
+    def test_hides_at_least_baseline(self, server, message, baseline):
+        filtered, was_filtered = server.filter_contact_info(message)
+        assert was_filtered == (baseline != message)
+        assert exposed(filtered) <= exposed(baseline), f"{message!r} -> {filtered!r}, baseline {baseline!r}"
@@ -0,0 +1,74 @@
+"""
+Test suite for owner payout retries
+Tests: send_owner_transfer and retry_stalled_payouts against a stubbed
+payouts collection and Stripe client, no backend or Stripe account needed
+"""
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+# Pure server logic, so it runs under `pytest --mock` too
+pytestmark = pytest.mark.mockable
+
+
+@pytest.fixture
+def db(server, monkeypatch):
+    """In-memory stand-in for the collections the payout code touches"""
+    fake = MagicMock()
+    fake.payouts.find_one_and_update = AsyncMock(return_value={"attempts": 1})
+    fake.payouts.update_one = AsyncMock()
+    monkeypatch.setattr(server, "db", fake)
+    return fake
+
+
+@pytest.fixture
+def transfers(server, monkeypatch):
+    create = MagicMock()
+    monkeypatch.setattr(server.stripe.Transfer, "create", create)
+    return create
+
+
+def failure_update(db):
+    """The update pipeline the last failed transfer wrote"""
+    return db.payouts.find_one_and_update.call_args.args[1]
+
+
+class TestPayoutRetries:
+    """A failed owner payout can be re-sent without ever paying twice"""
+
+    def test_rejected_transfer_gets_new_key(self, server, db, transfers):
+        transfers.side_effect = server.stripe.error.InvalidRequestError(
+            "Insufficient funds", param=None, http_status=400
+        )
+        asyncio.run(server.send_owner_transfer("b1", 95.0, "acct_1"))
+
+        update = failure_update(db)
+        assert update[0]["$set"]["status"] == "failed"
+        assert update[1]["$set"]["idempotency_key"] == {"$concat": ["payout-b1-", {"$toString": "$attempts"}]}
+
+    def test_unknown_outcome_keeps_key(self, server, db, transfers):
+        transfers.side_effect = server.stripe.error.APIConnectionError("Connection reset")
+        asyncio.run(server.send_owner_transfer("b1", 95.0, "acct_1"))
+
+        update = failure_update(db)
+        assert update[0]["$set"]["status"] == "failed"
+        assert not any("idempotency_key" in stage["$set"] for stage in update)
+
+    def test_failed_payout_retried_successfully(self, server, db, transfers):
+        db.payouts.find.return_value.to_list = AsyncMock(return_value=[
+            {"booking_id": "b1", "owner_id": "o1", "amount": 95.0, "idempotency_key": "payout-b1-1"}
+        ])
+        db.users.find.return_value.to_list = AsyncMock(return_value=[
+            {"id": "o1", "stripe_account_id": "acct_1"}
+        ])
+        transfers.return_value = MagicMock(id="tr_1")
+        asyncio.run(server.retry_stalled_payouts())
+
+        assert transfers.call_args.kwargs["idempotency_key"] == "payout-b1-1"
+        assert transfers.call_args.kwargs["destination"] == "acct_1"
+        db.payouts.update_one.assert_awaited_once_with(
+            {"booking_id": "b1"},
+            {"$set": {"status": "paid", "transfer_id": "tr_1"}}
+        )
+        # Owners who can't receive transfers yet don't use up attempts
+        assert db.users.find.call_args.args[0]["stripe_onboarding_complete"] is True
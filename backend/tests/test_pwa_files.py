@@ -3,30 +3,109 @@ PWA Files Test Suite
 Tests for Progressive Web App static files and configuration
 """
 import pytest
-import requests
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
 
+
+# Static assets don't change during a run, so each is requested once per session.
+# Bodies that are only searched are streamed so the scan can stop at the first hit;
+# icon tests only check status and headers, so they skip the body entirely.
+PWA_ASSETS = {
+    "manifest": ("GET", "/manifest.json", False),
+    "service_worker": ("GET", "/service-worker.js", True),
+    "offline_page": ("GET", "/offline.html", True),
+    "homepage": ("GET", "/", False),
+    "icon_192": ("HEAD", "/icon-192.png", False),
+    "icon_512": ("HEAD", "/icon-512.png", False),
+}
+
+@pytest.fixture(scope="session")
+def pwa_assets(http_session):
+    """Issue every asset request at once over the pooled session"""
+    def fetch(spec):
+        method, path, stream = spec
+        return http_session.request(method, f"{BASE_URL}{path}", stream=stream, allow_redirects=True)
+
+    with ThreadPoolExecutor(max_workers=len(PWA_ASSETS)) as pool:
+        return dict(zip(PWA_ASSETS, pool.map(fetch, PWA_ASSETS.values())))
+
+@pytest.fixture(scope="session")
+def manifest(pwa_assets):
+    return pwa_assets["manifest"]
+
+@pytest.fixture(scope="session")
+def manifest_data(manifest):
+    return manifest.json()
+
+@pytest.fixture(scope="session")
+def service_worker(pwa_assets):
+    return pwa_assets["service_worker"]
+
+@pytest.fixture(scope="session")
+def offline_page(pwa_assets):
+    return pwa_assets["offline_page"]
+
+@pytest.fixture(scope="session")
+def homepage(pwa_assets):
+    return pwa_assets["homepage"]
+
+@pytest.fixture(scope="session")
+def icon_192(pwa_assets):
+    return pwa_assets["icon_192"]
+
+@pytest.fixture(scope="session")
+def icon_512(pwa_assets):
+    return pwa_assets["icon_512"]
+
+def stream_matches(response, pattern, overlap=64):
+    """Yield pattern matches from a streamed body, carrying a tail across chunks
+    so matches shorter than `overlap` bytes aren't split. Stop iterating to
+    close the response without reading the rest."""
+    tail = b""
+    with response:
+        for chunk in response.iter_content(chunk_size=4096):
+            window = tail + chunk
+            yield from pattern.finditer(window)
+            tail = window[-overlap:]
+
+# Cache name definition and the install/fetch handlers, found in one pass
+SERVICE_WORKER_MARKERS = re.compile(rb"""(?P<cache_name>CACHE_NAME|cacheName)|addEventListener\((['"])(?P<event>install|fetch)\2""")
+
+@pytest.fixture(scope="session")
+def service_worker_markers(service_worker):
+    found = set()
+    for match in stream_matches(service_worker, SERVICE_WORKER_MARKERS):
+        found.add("cache_name" if match.group("cache_name") else match.group("event").decode())
+        if len(found) == 3:
+            break
+    return found
+
+OFFLINE_RETRY_PATTERN = re.compile(rb"reload|retry|try again", re.IGNORECASE)
+
+@pytest.fixture(scope="session")
+def offline_has_retry(offline_page):
+    return next(stream_matches(offline_page, OFFLINE_RETRY_PATTERN), None) is not None
+
+
 class TestPWAManifest:
     """Tests for PWA manifest.json file"""
     
-    def test_manifest_accessible(self):
+    def test_manifest_accessible(self, manifest):
         """Manifest file should be accessible at /manifest.json"""
-        response = requests.get(f"{BASE_URL}/manifest.json")
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert manifest.status_code == 200, f"Expected 200, got {manifest.status_code}"
     
-    def test_manifest_content_type(self):
+    def test_manifest_content_type(self, manifest):
         """Manifest should have correct content type"""
-        response = requests.get(f"{BASE_URL}/manifest.json")
-        content_type = response.headers.get('content-type', '')
+        content_type = manifest.headers.get('content-type', '')
         assert 'application/json' in content_type or 'application/manifest+json' in content_type, \
             f"Expected JSON content type, got {content_type}"
     
-    def test_manifest_required_fields(self):
+    def test_manifest_required_fields(self, manifest_data):
         """Manifest should contain required PWA fields"""
-        response = requests.get(f"{BASE_URL}/manifest.json")
-        data = response.json()
+        data = manifest_data
         
         # Required fields for PWA
         assert 'name' in data, "Manifest missing 'name' field"
@@ -39,10 +118,9 @@ class TestPWAManifest:
         assert data['display'] in ['standalone', 'fullscreen', 'minimal-ui', 'browser'], \
             f"Invalid display mode: {data['display']}"
     
-    def test_manifest_icons_configuration(self):
+    def test_manifest_icons_configuration(self, manifest_data):
         """Manifest should have properly configured icons"""
-        response = requests.get(f"{BASE_URL}/manifest.json")
-        data = response.json()
+        data = manifest_data
         
         icons = data.get('icons', [])
         assert len(icons) >= 2, "Manifest should have at least 2 icons (192x192 and 512x512)"
@@ -52,10 +130,9 @@ class TestPWAManifest:
         assert '192x192' in sizes, "Missing 192x192 icon"
         assert '512x512' in sizes, "Missing 512x512 icon"
     
-    def test_manifest_theme_color(self):
+    def test_manifest_theme_color(self, manifest_data):
         """Manifest should have theme_color defined"""
-        response = requests.get(f"{BASE_URL}/manifest.json")
-        data = response.json()
+        data = manifest_data
         
         assert 'theme_color' in data, "Manifest missing 'theme_color' field"
         assert data['theme_color'].startswith('#'), "theme_color should be a hex color"
@@ -64,113 +141,87 @@ class TestPWAManifest:
 class TestPWAIcons:
     """Tests for PWA icon files"""
     
-    def test_icon_192_accessible(self):
+    def test_icon_192_accessible(self, icon_192):
         """192x192 icon should be accessible"""
-        response = requests.get(f"{BASE_URL}/icon-192.png")
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert icon_192.status_code == 200, f"Expected 200, got {icon_192.status_code}"
     
-    def test_icon_192_content_type(self):
+    def test_icon_192_content_type(self, icon_192):
         """192x192 icon should have correct content type"""
-        response = requests.get(f"{BASE_URL}/icon-192.png")
-        content_type = response.headers.get('content-type', '')
+        content_type = icon_192.headers.get('content-type', '')
         assert 'image/png' in content_type, f"Expected image/png, got {content_type}"
     
-    def test_icon_512_accessible(self):
+    def test_icon_512_accessible(self, icon_512):
         """512x512 icon should be accessible"""
-        response = requests.get(f"{BASE_URL}/icon-512.png")
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert icon_512.status_code == 200, f"Expected 200, got {icon_512.status_code}"
     
-    def test_icon_512_content_type(self):
+    def test_icon_512_content_type(self, icon_512):
         """512x512 icon should have correct content type"""
-        response = requests.get(f"{BASE_URL}/icon-512.png")
-        content_type = response.headers.get('content-type', '')
+        content_type = icon_512.headers.get('content-type', '')
         assert 'image/png' in content_type, f"Expected image/png, got {content_type}"
 
 
 class TestServiceWorker:
     """Tests for service worker file"""
     
-    def test_service_worker_accessible(self):
+    def test_service_worker_accessible(self, service_worker):
         """Service worker should be accessible at /service-worker.js"""
-        response = requests.get(f"{BASE_URL}/service-worker.js")
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert service_worker.status_code == 200, f"Expected 200, got {service_worker.status_code}"
     
-    def test_service_worker_content_type(self):
+    def test_service_worker_content_type(self, service_worker):
         """Service worker should have JavaScript content type"""
-        response = requests.get(f"{BASE_URL}/service-worker.js")
-        content_type = response.headers.get('content-type', '')
+        content_type = service_worker.headers.get('content-type', '')
         assert 'javascript' in content_type or 'text/plain' in content_type, \
             f"Expected JavaScript content type, got {content_type}"
     
-    def test_service_worker_contains_cache_name(self):
+    def test_service_worker_contains_cache_name(self, service_worker_markers):
         """Service worker should define a cache name"""
-        response = requests.get(f"{BASE_URL}/service-worker.js")
-        content = response.text
-        assert 'CACHE_NAME' in content or 'cacheName' in content, \
-            "Service worker should define a cache name"
+        assert 'cache_name' in service_worker_markers, "Service worker should define a cache name"
     
-    def test_service_worker_contains_install_handler(self):
+    def test_service_worker_contains_install_handler(self, service_worker_markers):
         """Service worker should have install event handler"""
-        response = requests.get(f"{BASE_URL}/service-worker.js")
-        content = response.text
-        assert "addEventListener('install'" in content or 'addEventListener("install"' in content, \
-            "Service worker should have install event handler"
+        assert 'install' in service_worker_markers, "Service worker should have install event handler"
     
-    def test_service_worker_contains_fetch_handler(self):
+    def test_service_worker_contains_fetch_handler(self, service_worker_markers):
         """Service worker should have fetch event handler"""
-        response = requests.get(f"{BASE_URL}/service-worker.js")
-        content = response.text
-        assert "addEventListener('fetch'" in content or 'addEventListener("fetch"' in content, \
-            "Service worker should have fetch event handler"
+        assert 'fetch' in service_worker_markers, "Service worker should have fetch event handler"
 
 
 class TestOfflinePage:
     """Tests for offline fallback page"""
     
-    def test_offline_page_accessible(self):
+    def test_offline_page_accessible(self, offline_page):
         """Offline page should be accessible at /offline.html"""
-        response = requests.get(f"{BASE_URL}/offline.html")
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert offline_page.status_code == 200, f"Expected 200, got {offline_page.status_code}"
     
-    def test_offline_page_content_type(self):
+    def test_offline_page_content_type(self, offline_page):
         """Offline page should have HTML content type"""
-        response = requests.get(f"{BASE_URL}/offline.html")
-        content_type = response.headers.get('content-type', '')
+        content_type = offline_page.headers.get('content-type', '')
         assert 'text/html' in content_type, f"Expected text/html, got {content_type}"
     
-    def test_offline_page_contains_retry_button(self):
+    def test_offline_page_contains_retry_button(self, offline_has_retry):
         """Offline page should have a retry/reload button"""
-        response = requests.get(f"{BASE_URL}/offline.html")
-        content = response.text.lower()
-        assert 'reload' in content or 'retry' in content or 'try again' in content, \
+        assert offline_has_retry, \
             "Offline page should have a retry mechanism"
 
 
 class TestHomepagePWAMeta:
     """Tests for PWA meta tags in homepage"""
     
-    def test_homepage_accessible(self):
+    def test_homepage_accessible(self, homepage):
         """Homepage should be accessible"""
-        response = requests.get(f"{BASE_URL}/")
-        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert homepage.status_code == 200, f"Expected 200, got {homepage.status_code}"
     
-    def test_homepage_has_manifest_link(self):
+    def test_homepage_has_manifest_link(self, homepage):
         """Homepage should link to manifest.json"""
-        response = requests.get(f"{BASE_URL}/")
-        content = response.text
-        assert 'manifest.json' in content, "Homepage should link to manifest.json"
+        assert b'manifest.json' in homepage.content, "Homepage should link to manifest.json"
     
-    def test_homepage_has_theme_color_meta(self):
+    def test_homepage_has_theme_color_meta(self, homepage):
         """Homepage should have theme-color meta tag"""
-        response = requests.get(f"{BASE_URL}/")
-        content = response.text
-        assert 'theme-color' in content, "Homepage should have theme-color meta tag"
+        assert b'theme-color' in homepage.content, "Homepage should have theme-color meta tag"
     
-    def test_homepage_has_apple_meta_tags(self):
+    def test_homepage_has_apple_meta_tags(self, homepage):
         """Homepage should have Apple PWA meta tags"""
-        response = requests.get(f"{BASE_URL}/")
-        content = response.text
-        assert 'apple-mobile-web-app-capable' in content, \
+        assert b'apple-mobile-web-app-capable' in homepage.content, \
             "Homepage should have apple-mobile-web-app-capable meta tag"
 
 
@@ -1,221 +1,272 @@
 """
 Test suite for Surge Pricing and Long-term Discounts Feature
 Tests: surge_enabled, surge_percentage, surge_weekends, discount_weekly, discount_monthly, discount_quarterly
+
+Shared listings and bookings are module fixtures rather than class state, and
+tests touching the same listing share an xdist group, so the suite can run in
+parallel with: pytest -n 4 --dist loadgroup
 """
 import pytest
-import requests
-import os
-import uuid
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+from conftest import USER_SUFFIX, assert_fields, authenticated_session
+
+# Covered by the in-process API stand-in, see `pytest --mock`
+pytestmark = pytest.mark.mockable
 
-BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+# Paths relative to the API root the authenticated sessions are bound to
+LISTINGS = "listings"
+BOOKINGS = "bookings"
 
 # Test user credentials
-TEST_OWNER_EMAIL = f"test_surge_owner_{uuid.uuid4().hex[:8]}@example.com"
+TEST_OWNER_EMAIL = f"test_surge_owner_{USER_SUFFIX}@example.com"
 TEST_OWNER_PASSWORD = "OwnerPass123!"
 TEST_OWNER_NAME = "Test Surge Owner"
 
-TEST_RENTER_EMAIL = f"test_surge_renter_{uuid.uuid4().hex[:8]}@example.com"
+TEST_RENTER_EMAIL = f"test_surge_renter_{USER_SUFFIX}@example.com"
 TEST_RENTER_PASSWORD = "RenterPass123!"
 TEST_RENTER_NAME = "Test Surge Renter"
 
+# One reference time for the whole run so dates don't shift across midnight
+BASE = datetime.now()
 
-class TestSurgePricingAndDiscounts:
-    """Test surge pricing and long-term discounts backend APIs"""
+# Day offsets from BASE of the next Monday, Friday and Saturday (never today)
+NEXT_MONDAY = (0 - BASE.weekday()) % 7 or 7
+NEXT_FRIDAY = (4 - BASE.weekday()) % 7 or 7
+NEXT_SATURDAY = (5 - BASE.weekday()) % 7 or 7
+
+
+@lru_cache(maxsize=None)
+def DAY(offset):
+    """YYYY-MM-DD date string `offset` days after BASE"""
+    return (BASE + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+# Module-scoped so both users keep their sessions across every test here; the
+# sessions share the conftest http_pool, so owner and renter reuse the same sockets
+@pytest.fixture(scope="module")
+def owner_session(http_pool):
+    """Create and authenticate owner user"""
+    return authenticated_session(TEST_OWNER_EMAIL, TEST_OWNER_PASSWORD, TEST_OWNER_NAME, http_pool)
+
+
+@pytest.fixture(scope="module")
+def renter_session(http_pool):
+    """Create and authenticate renter user"""
+    return authenticated_session(TEST_RENTER_EMAIL, TEST_RENTER_PASSWORD, TEST_RENTER_NAME, http_pool)
+
+
+# Listing payloads shared by the tests below
+LISTING_SPECS = {
+    "surge": {
+        "title": "TEST_Surge Pricing Camera",
+        "description": "Camera with weekend surge pricing",
+        "category": "photography",
+        "price_per_day": 100.00,
+        "surge_enabled": True,
+        "surge_percentage": 20.0,
+        "surge_weekends": True,
+        "surge_dates": [],
+        "location": "New York, NY",
+        "latitude": 40.7128,
+        "longitude": -74.0060,
+        "images": ["https://example.com/camera.jpg"]
+    },
+    "discount": {
+        "title": "TEST_Discount Bike",
+        "description": "Bike with long-term rental discounts",
+        "category": "bikes",
+        "price_per_day": 50.00,
+        "discount_weekly": 5.0,    # 5% off for 7+ days
+        "discount_monthly": 15.0,  # 15% off for 30+ days
+        "discount_quarterly": 25.0, # 25% off for 90+ days
+        "location": "Brooklyn, NY",
+        "latitude": 40.6782,
+        "longitude": -73.9442,
+        "images": ["https://example.com/bike.jpg"]
+    },
+    "full_pricing": {
+        "title": "TEST_Full Pricing Equipment",
+        "description": "Equipment with surge and discounts",
+        "category": "tools",
+        "price_per_day": 75.00,
+        "surge_enabled": True,
+        "surge_percentage": 25.0,
+        "surge_weekends": True,
+        "discount_weekly": 10.0,
+        "discount_monthly": 20.0,
+        "discount_quarterly": 30.0,
+        "location": "Manhattan, NY",
+        "latitude": 40.7831,
+        "longitude": -73.9712,
+        "images": ["https://example.com/equipment.jpg"]
+    },
+    "no_surge": {
+        "title": "TEST_No Surge Item",
+        "description": "Item without surge pricing",
+        "category": "tools",
+        "price_per_day": 100.00,
+        "surge_enabled": False,
+        "location": "Queens, NY",
+        "latitude": 40.7282,
+        "longitude": -73.7949,
+        "images": ["https://example.com/item.jpg"]
+    },
+    "no_discount": {
+        "title": "TEST_No Discount Item",
+        "description": "Item without discounts",
+        "category": "tools",
+        "price_per_day": 50.00,
+        "discount_weekly": 0,
+        "discount_monthly": 0,
+        "discount_quarterly": 0,
+        "location": "Bronx, NY",
+        "latitude": 40.8448,
+        "longitude": -73.8648,
+        "images": ["https://example.com/item2.jpg"]
+    }
+}
+
+# Encoded once; the sessions already send Content-Type: application/json
+LISTING_PAYLOADS = {kind: orjson.dumps(spec) for kind, spec in LISTING_SPECS.items()}
+
+
+# (kind, expected fields) for each listing in LISTING_SPECS
+LISTING_CASES = [
+    pytest.param("surge", {"surge_enabled": True, "surge_percentage": 20.0, "surge_weekends": True},
+                 id="surge", marks=pytest.mark.xdist_group(name="surge_listing")),
+    pytest.param("discount", {"discount_weekly": 5.0, "discount_monthly": 15.0, "discount_quarterly": 25.0},
+                 id="discount", marks=pytest.mark.xdist_group(name="discount_listing")),
+    pytest.param("full_pricing", {"surge_enabled": True, "surge_percentage": 25.0, "discount_weekly": 10.0,
+                                  "discount_monthly": 20.0, "discount_quarterly": 30.0},
+                 id="surge+discount", marks=pytest.mark.xdist_group(name="full_pricing_listing")),
+]
+
+
+@pytest.fixture(scope="module")
+def listings(owner_session):
+    """Create every shared listing concurrently over the pooled session"""
+    def create(payload):
+        return owner_session.post(LISTINGS, data=payload)
     
-    @pytest.fixture(scope="class")
-    def owner_session(self):
-        """Create and authenticate owner user"""
-        session = requests.Session()
-        session.headers.update({"Content-Type": "application/json"})
-        
-        register_res = session.post(f"{BASE_URL}/api/auth/register", json={
-            "email": TEST_OWNER_EMAIL,
-            "password": TEST_OWNER_PASSWORD,
-            "name": TEST_OWNER_NAME
-        })
-        
-        if register_res.status_code == 400:
-            login_res = session.post(f"{BASE_URL}/api/auth/login", json={
-                "email": TEST_OWNER_EMAIL,
-                "password": TEST_OWNER_PASSWORD
-            })
-            assert login_res.status_code == 200, f"Login failed: {login_res.text}"
-            token = login_res.json()["token"]
-        else:
-            assert register_res.status_code == 200, f"Register failed: {register_res.text}"
-            token = register_res.json()["token"]
-        
-        session.headers.update({"Authorization": f"Bearer {token}"})
-        return session
+    with ThreadPoolExecutor(max_workers=len(LISTING_PAYLOADS)) as pool:
+        return dict(zip(LISTING_PAYLOADS, pool.map(create, LISTING_PAYLOADS.values())))
+
+
+@pytest.fixture(scope="module")
+def surge_listing(listings):
+    """Listing with 20% weekend surge pricing"""
+    return listings["surge"]
+
+
+@pytest.fixture(scope="module")
+def discount_listing(listings):
+    """Listing with weekly, monthly and quarterly discounts"""
+    return listings["discount"]
+
+
+@pytest.fixture(scope="module")
+def full_pricing_listing(listings):
+    """Listing with both weekend surge pricing and long-term discounts"""
+    return listings["full_pricing"]
+
+
+@pytest.fixture(scope="module")
+def no_surge_listing(listings):
+    """Listing with surge pricing disabled"""
+    return listings["no_surge"]
+
+
+@pytest.fixture(scope="module")
+def no_discount_listing(listings):
+    """Listing with every long-term discount set to zero"""
+    return listings["no_discount"]
+
+
+@pytest.fixture(scope="module")
+def surge_booking(renter_session, surge_listing):
+    """Friday-to-Monday booking on the surge listing, spanning both weekend days"""
+    # Book Friday to Monday (includes Sat & Sun = 2 surge days)
+    start = DAY(NEXT_SATURDAY - 1)  # Friday
+    end = DAY(NEXT_SATURDAY + 2)    # Monday (3 days)
     
-    @pytest.fixture(scope="class")
-    def renter_session(self):
-        """Create and authenticate renter user"""
-        session = requests.Session()
-        session.headers.update({"Content-Type": "application/json"})
-        
-        register_res = session.post(f"{BASE_URL}/api/auth/register", json={
-            "email": TEST_RENTER_EMAIL,
-            "password": TEST_RENTER_PASSWORD,
-            "name": TEST_RENTER_NAME
-        })
-        
-        if register_res.status_code == 400:
-            login_res = session.post(f"{BASE_URL}/api/auth/login", json={
-                "email": TEST_RENTER_EMAIL,
-                "password": TEST_RENTER_PASSWORD
-            })
-            assert login_res.status_code == 200, f"Login failed: {login_res.text}"
-            token = login_res.json()["token"]
-        else:
-            assert register_res.status_code == 200, f"Register failed: {register_res.text}"
-            token = register_res.json()["token"]
-        
-        session.headers.update({"Authorization": f"Bearer {token}"})
-        return session
+    booking_data = {
+        "listing_id": surge_listing.json()["id"],
+        "start_date": start,
+        "end_date": end,
+        "duration_type": "daily"
+    }
     
-    # ============== LISTING CREATION WITH SURGE & DISCOUNTS ==============
+    return renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
+
+
+@pytest.fixture(scope="module")
+def weekly_discount_booking(renter_session, discount_listing):
+    """7-day booking on the discount listing"""
+    start = DAY(30)
+    end = DAY(37)  # 7 days
     
-    def test_create_listing_with_surge_pricing(self, owner_session):
-        """Test creating a listing with surge pricing enabled"""
-        listing_data = {
-            "title": "TEST_Surge Pricing Camera",
-            "description": "Camera with weekend surge pricing",
-            "category": "photography",
-            "price_per_day": 100.00,
-            "surge_enabled": True,
-            "surge_percentage": 20.0,
-            "surge_weekends": True,
-            "surge_dates": [],
-            "location": "New York, NY",
-            "latitude": 40.7128,
-            "longitude": -74.0060,
-            "images": ["https://example.com/camera.jpg"]
-        }
-        
-        response = owner_session.post(f"{BASE_URL}/api/listings", json=listing_data)
-        assert response.status_code == 200, f"Create listing failed: {response.text}"
-        
-        data = response.json()
-        assert data["surge_enabled"] == True
-        assert data["surge_percentage"] == 20.0
-        assert data["surge_weekends"] == True
-        assert "id" in data
-        
-        self.__class__.surge_listing_id = data["id"]
-        print(f"Created listing with surge pricing: {data['id']}")
+    booking_data = {
+        "listing_id": discount_listing.json()["id"],
+        "start_date": start,
+        "end_date": end,
+        "duration_type": "daily"
+    }
     
-    def test_create_listing_with_long_term_discounts(self, owner_session):
-        """Test creating a listing with long-term discounts"""
-        listing_data = {
-            "title": "TEST_Discount Bike",
-            "description": "Bike with long-term rental discounts",
-            "category": "bikes",
-            "price_per_day": 50.00,
-            "discount_weekly": 5.0,    # 5% off for 7+ days
-            "discount_monthly": 15.0,  # 15% off for 30+ days
-            "discount_quarterly": 25.0, # 25% off for 90+ days
-            "location": "Brooklyn, NY",
-            "latitude": 40.6782,
-            "longitude": -73.9442,
-            "images": ["https://example.com/bike.jpg"]
-        }
-        
-        response = owner_session.post(f"{BASE_URL}/api/listings", json=listing_data)
-        assert response.status_code == 200, f"Create listing failed: {response.text}"
-        
-        data = response.json()
-        assert data["discount_weekly"] == 5.0
-        assert data["discount_monthly"] == 15.0
-        assert data["discount_quarterly"] == 25.0
-        
-        self.__class__.discount_listing_id = data["id"]
-        print(f"Created listing with discounts: {data['id']}")
+    return renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
+
+
+class TestSurgePricingAndDiscounts:
+    """Test surge pricing and long-term discounts backend APIs"""
     
-    def test_create_listing_with_surge_and_discounts(self, owner_session):
-        """Test creating a listing with both surge pricing and discounts"""
-        listing_data = {
-            "title": "TEST_Full Pricing Equipment",
-            "description": "Equipment with surge and discounts",
-            "category": "tools",
-            "price_per_day": 75.00,
-            "surge_enabled": True,
-            "surge_percentage": 25.0,
-            "surge_weekends": True,
-            "discount_weekly": 10.0,
-            "discount_monthly": 20.0,
-            "discount_quarterly": 30.0,
-            "location": "Manhattan, NY",
-            "latitude": 40.7831,
-            "longitude": -73.9712,
-            "images": ["https://example.com/equipment.jpg"]
-        }
-        
-        response = owner_session.post(f"{BASE_URL}/api/listings", json=listing_data)
+    # ============== LISTING CREATION WITH SURGE & DISCOUNTS ==============
+    
+    @pytest.mark.parametrize("kind,expected", LISTING_CASES)
+    def test_create_listing(self, listings, kind, expected):
+        """Test creating a listing with surge pricing, long-term discounts, or both"""
+        response = listings[kind]
         assert response.status_code == 200, f"Create listing failed: {response.text}"
         
         data = response.json()
-        assert data["surge_enabled"] == True
-        assert data["surge_percentage"] == 25.0
-        assert data["discount_weekly"] == 10.0
-        assert data["discount_monthly"] == 20.0
-        assert data["discount_quarterly"] == 30.0
-        
-        self.__class__.full_pricing_listing_id = data["id"]
-        print(f"Created listing with surge and discounts: {data['id']}")
+        assert "id" in data
+        assert_fields(data, expected)
+        print(f"Created {kind} listing: {data['id']}")
     
     # ============== LISTING RETRIEVAL TESTS ==============
     
-    def test_get_listing_shows_surge_fields(self, owner_session):
+    @pytest.mark.xdist_group(name="surge_listing")
+    def test_get_listing_shows_surge_fields(self, renter_session, surge_listing):
         """Test that retrieved listing shows surge pricing fields"""
-        response = owner_session.get(f"{BASE_URL}/api/listings/{self.surge_listing_id}")
+        response = renter_session.get(f"{LISTINGS}/{surge_listing.json()['id']}")
         assert response.status_code == 200, f"Get listing failed: {response.text}"
         
         data = response.json()
-        assert "surge_enabled" in data
-        assert "surge_percentage" in data
-        assert "surge_weekends" in data
-        assert data["surge_enabled"] == True
-        assert data["surge_percentage"] == 20.0
+        missing = {"surge_enabled", "surge_percentage", "surge_weekends"} - data.keys()
+        assert not missing, f"Missing fields: {missing}"
+        assert_fields(data, {"surge_enabled": True, "surge_percentage": 20.0})
         print(f"Listing shows surge fields correctly")
     
-    def test_get_listing_shows_discount_fields(self, owner_session):
+    @pytest.mark.xdist_group(name="discount_listing")
+    def test_get_listing_shows_discount_fields(self, renter_session, discount_listing):
         """Test that retrieved listing shows discount fields"""
-        response = owner_session.get(f"{BASE_URL}/api/listings/{self.discount_listing_id}")
+        response = renter_session.get(f"{LISTINGS}/{discount_listing.json()['id']}")
         assert response.status_code == 200, f"Get listing failed: {response.text}"
         
         data = response.json()
-        assert "discount_weekly" in data
-        assert "discount_monthly" in data
-        assert "discount_quarterly" in data
-        assert data["discount_weekly"] == 5.0
-        assert data["discount_monthly"] == 15.0
-        assert data["discount_quarterly"] == 25.0
+        missing = {"discount_weekly", "discount_monthly", "discount_quarterly"} - data.keys()
+        assert not missing, f"Missing fields: {missing}"
+        assert_fields(data, {"discount_weekly": 5.0, "discount_monthly": 15.0, "discount_quarterly": 25.0})
         print(f"Listing shows discount fields correctly")
     
     # ============== SURGE PRICING BOOKING TESTS ==============
     
-    def test_booking_with_weekend_surge(self, renter_session):
+    @pytest.mark.xdist_group(name="surge_listing")
+    def test_booking_with_weekend_surge(self, surge_booking):
         """Test booking that includes weekend days applies surge pricing"""
-        # Find next Saturday
-        today = datetime.now()
-        days_until_saturday = (5 - today.weekday()) % 7
-        if days_until_saturday == 0:
-            days_until_saturday = 7
-        
-        # Book Friday to Monday (includes Sat & Sun = 2 surge days)
-        start = (today + timedelta(days=days_until_saturday - 1)).strftime("%Y-%m-%d")  # Friday
-        end = (today + timedelta(days=days_until_saturday + 2)).strftime("%Y-%m-%d")    # Monday (3 days)
-        
-        booking_data = {
-            "listing_id": self.surge_listing_id,
-            "start_date": start,
-            "end_date": end,
-            "duration_type": "daily"
-        }
-        
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = surge_booking
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -225,29 +276,23 @@ class TestSurgePricingAndDiscounts:
         assert data["total_price"] > 300, f"Surge should increase price above base $300, got ${data['total_price']}"
         assert "surge_days" in data or data["total_price"] >= 320  # Verify surge was applied
         
-        self.__class__.surge_booking_id = data["id"]
         print(f"Created weekend booking with surge: ${data['total_price']}")
     
-    def test_booking_weekday_only_no_surge(self, renter_session):
+    @pytest.mark.xdist_group(name="surge_listing")
+    def test_booking_weekday_only_no_surge(self, renter_session, surge_listing):
         """Test booking on weekdays only does not apply surge"""
-        # Find next Monday
-        today = datetime.now()
-        days_until_monday = (0 - today.weekday()) % 7
-        if days_until_monday == 0:
-            days_until_monday = 7
-        
         # Book Monday to Wednesday (no weekends)
-        start = (today + timedelta(days=days_until_monday + 7)).strftime("%Y-%m-%d")  # Monday
-        end = (today + timedelta(days=days_until_monday + 9)).strftime("%Y-%m-%d")    # Wednesday (2 days)
+        start = DAY(NEXT_MONDAY + 7)  # Monday
+        end = DAY(NEXT_MONDAY + 9)    # Wednesday (2 days)
         
         booking_data = {
-            "listing_id": self.surge_listing_id,
+            "listing_id": surge_listing.json()["id"],
             "start_date": start,
             "end_date": end,
             "duration_type": "daily"
         }
         
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -257,19 +302,10 @@ class TestSurgePricingAndDiscounts:
     
     # ============== LONG-TERM DISCOUNT BOOKING TESTS ==============
     
-    def test_booking_7_days_weekly_discount(self, renter_session):
+    @pytest.mark.xdist_group(name="discount_listing")
+    def test_booking_7_days_weekly_discount(self, weekly_discount_booking):
         """Test 7+ day booking applies weekly discount"""
-        start = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-        end = (datetime.now() + timedelta(days=37)).strftime("%Y-%m-%d")  # 7 days
-        
-        booking_data = {
-            "listing_id": self.discount_listing_id,
-            "start_date": start,
-            "end_date": end,
-            "duration_type": "daily"
-        }
-        
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = weekly_discount_booking
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -278,22 +314,22 @@ class TestSurgePricingAndDiscounts:
         expected_price = 350 * 0.95
         assert abs(data["total_price"] - expected_price) < 1, f"Expected ~${expected_price}, got ${data['total_price']}"
         
-        self.__class__.weekly_discount_booking_id = data["id"]
         print(f"Created 7-day booking with weekly discount: ${data['total_price']}")
     
-    def test_booking_30_days_monthly_discount(self, renter_session):
+    @pytest.mark.xdist_group(name="discount_listing")
+    def test_booking_30_days_monthly_discount(self, renter_session, discount_listing):
         """Test 30+ day booking applies monthly discount"""
-        start = (datetime.now() + timedelta(days=50)).strftime("%Y-%m-%d")
-        end = (datetime.now() + timedelta(days=80)).strftime("%Y-%m-%d")  # 30 days
+        start = DAY(50)
+        end = DAY(80)  # 30 days
         
         booking_data = {
-            "listing_id": self.discount_listing_id,
+            "listing_id": discount_listing.json()["id"],
             "start_date": start,
             "end_date": end,
             "duration_type": "daily"
         }
         
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -304,19 +340,20 @@ class TestSurgePricingAndDiscounts:
         
         print(f"Created 30-day booking with monthly discount: ${data['total_price']}")
     
-    def test_booking_90_days_quarterly_discount(self, renter_session):
+    @pytest.mark.xdist_group(name="discount_listing")
+    def test_booking_90_days_quarterly_discount(self, renter_session, discount_listing):
         """Test 90+ day booking applies quarterly discount"""
-        start = (datetime.now() + timedelta(days=100)).strftime("%Y-%m-%d")
-        end = (datetime.now() + timedelta(days=190)).strftime("%Y-%m-%d")  # 90 days
+        start = DAY(100)
+        end = DAY(190)  # 90 days
         
         booking_data = {
-            "listing_id": self.discount_listing_id,
+            "listing_id": discount_listing.json()["id"],
             "start_date": start,
             "end_date": end,
             "duration_type": "daily"
         }
         
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -329,26 +366,21 @@ class TestSurgePricingAndDiscounts:
     
     # ============== COMBINED SURGE + DISCOUNT TESTS ==============
     
-    def test_booking_with_surge_and_weekly_discount(self, renter_session):
+    @pytest.mark.xdist_group(name="full_pricing_listing")
+    def test_booking_with_surge_and_weekly_discount(self, renter_session, full_pricing_listing):
         """Test booking with both surge pricing and weekly discount"""
-        # Find next Friday for a 7-day booking including weekend
-        today = datetime.now()
-        days_until_friday = (4 - today.weekday()) % 7
-        if days_until_friday == 0:
-            days_until_friday = 7
-        
         # Book Friday to next Friday (7 days, includes 2 weekend days)
-        start = (today + timedelta(days=days_until_friday + 14)).strftime("%Y-%m-%d")
-        end = (today + timedelta(days=days_until_friday + 21)).strftime("%Y-%m-%d")
+        start = DAY(NEXT_FRIDAY + 14)
+        end = DAY(NEXT_FRIDAY + 21)
         
         booking_data = {
-            "listing_id": self.full_pricing_listing_id,
+            "listing_id": full_pricing_listing.json()["id"],
             "start_date": start,
             "end_date": end,
             "duration_type": "daily"
         }
         
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -364,9 +396,10 @@ class TestSurgePricingAndDiscounts:
     
     # ============== BOOKING RESPONSE FIELD TESTS ==============
     
-    def test_booking_response_includes_surge_info(self, renter_session):
+    @pytest.mark.xdist_group(name="surge_listing")
+    def test_booking_response_includes_surge_info(self, renter_session, surge_booking):
         """Test that booking response includes surge pricing info"""
-        response = renter_session.get(f"{BASE_URL}/api/bookings/{self.surge_booking_id}")
+        response = renter_session.get(f"{BOOKINGS}/{surge_booking.json()['id']}")
         assert response.status_code == 200, f"Get booking failed: {response.text}"
         
         data = response.json()
@@ -374,9 +407,10 @@ class TestSurgePricingAndDiscounts:
         assert "surge_days" in data or "surge_percentage" in data, "Booking should include surge info"
         print(f"Booking response includes surge info: surge_days={data.get('surge_days')}, surge_percentage={data.get('surge_percentage')}")
     
-    def test_booking_response_includes_discount_info(self, renter_session):
+    @pytest.mark.xdist_group(name="discount_listing")
+    def test_booking_response_includes_discount_info(self, renter_session, weekly_discount_booking):
         """Test that booking response includes discount info"""
-        response = renter_session.get(f"{BASE_URL}/api/bookings/{self.weekly_discount_booking_id}")
+        response = renter_session.get(f"{BOOKINGS}/{weekly_discount_booking.json()['id']}")
         assert response.status_code == 200, f"Get booking failed: {response.text}"
         
         data = response.json()
@@ -386,42 +420,21 @@ class TestSurgePricingAndDiscounts:
     
     # ============== EDGE CASE TESTS ==============
     
-    def test_listing_without_surge_no_surge_applied(self, renter_session, owner_session):
+    @pytest.mark.xdist_group(name="no_surge_listing")
+    def test_listing_without_surge_no_surge_applied(self, renter_session, no_surge_listing):
         """Test that listing without surge enabled doesn't apply surge"""
-        # Create listing without surge
-        listing_data = {
-            "title": "TEST_No Surge Item",
-            "description": "Item without surge pricing",
-            "category": "tools",
-            "price_per_day": 100.00,
-            "surge_enabled": False,
-            "location": "Queens, NY",
-            "latitude": 40.7282,
-            "longitude": -73.7949,
-            "images": ["https://example.com/item.jpg"]
-        }
-        
-        create_res = owner_session.post(f"{BASE_URL}/api/listings", json=listing_data)
-        assert create_res.status_code == 200
-        listing_id = create_res.json()["id"]
-        
         # Book over weekend
-        today = datetime.now()
-        days_until_saturday = (5 - today.weekday()) % 7
-        if days_until_saturday == 0:
-            days_until_saturday = 7
-        
-        start = (today + timedelta(days=days_until_saturday + 21)).strftime("%Y-%m-%d")
-        end = (today + timedelta(days=days_until_saturday + 23)).strftime("%Y-%m-%d")  # 2 days over weekend
+        start = DAY(NEXT_SATURDAY + 21)
+        end = DAY(NEXT_SATURDAY + 23)  # 2 days over weekend
         
         booking_data = {
-            "listing_id": listing_id,
+            "listing_id": no_surge_listing.json()["id"],
             "start_date": start,
             "end_date": end,
             "duration_type": "daily"
         }
         
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -429,39 +442,21 @@ class TestSurgePricingAndDiscounts:
         assert data["total_price"] == 200.00, f"No surge should be applied, expected $200, got ${data['total_price']}"
         print(f"Booking without surge: ${data['total_price']}")
     
-    def test_listing_without_discounts_no_discount_applied(self, renter_session, owner_session):
+    @pytest.mark.xdist_group(name="no_discount_listing")
+    def test_listing_without_discounts_no_discount_applied(self, renter_session, no_discount_listing):
         """Test that listing without discounts doesn't apply discount"""
-        # Create listing without discounts
-        listing_data = {
-            "title": "TEST_No Discount Item",
-            "description": "Item without discounts",
-            "category": "tools",
-            "price_per_day": 50.00,
-            "discount_weekly": 0,
-            "discount_monthly": 0,
-            "discount_quarterly": 0,
-            "location": "Bronx, NY",
-            "latitude": 40.8448,
-            "longitude": -73.8648,
-            "images": ["https://example.com/item2.jpg"]
-        }
-        
-        create_res = owner_session.post(f"{BASE_URL}/api/listings", json=listing_data)
-        assert create_res.status_code == 200
-        listing_id = create_res.json()["id"]
-        
         # Book for 7 days
-        start = (datetime.now() + timedelta(days=200)).strftime("%Y-%m-%d")
-        end = (datetime.now() + timedelta(days=207)).strftime("%Y-%m-%d")
+        start = DAY(200)
+        end = DAY(207)
         
         booking_data = {
-            "listing_id": listing_id,
+            "listing_id": no_discount_listing.json()["id"],
             "start_date": start,
             "end_date": end,
             "duration_type": "daily"
         }
         
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -469,19 +464,20 @@ class TestSurgePricingAndDiscounts:
         assert data["total_price"] == 350.00, f"No discount should be applied, expected $350, got ${data['total_price']}"
         print(f"Booking without discount: ${data['total_price']}")
     
-    def test_short_booking_no_discount(self, renter_session):
+    @pytest.mark.xdist_group(name="discount_listing")
+    def test_short_booking_no_discount(self, renter_session, discount_listing):
         """Test that booking less than 7 days doesn't get discount"""
-        start = (datetime.now() + timedelta(days=220)).strftime("%Y-%m-%d")
-        end = (datetime.now() + timedelta(days=225)).strftime("%Y-%m-%d")  # 5 days
+        start = DAY(220)
+        end = DAY(225)  # 5 days
         
         booking_data = {
-            "listing_id": self.discount_listing_id,
+            "listing_id": discount_listing.json()["id"],
             "start_date": start,
             "end_date": end,
             "duration_type": "daily"
         }
         
-        response = renter_session.post(f"{BASE_URL}/api/bookings", json=booking_data)
+        response = renter_session.post(BOOKINGS, data=orjson.dumps(booking_data))
         assert response.status_code == 200, f"Create booking failed: {response.text}"
         
         data = response.json()
@@ -1,70 +1,111 @@
 import requests
+from requests.adapters import HTTPAdapter
 import sys
-import json
+import orjson
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+# Request payloads that are the same on every run; run_test only reads them
+TEST_LISTING = {
+    "title": "Test Camera Rental",
+    "description": "Professional DSLR camera for rent. Perfect for events and photography.",
+    "category": "electronics",
+    "price_per_day": 50.0,
+    "location": "New York, NY",
+    "latitude": 40.7128,
+    "longitude": -74.0060,
+    "images": ["https://images.unsplash.com/photo-1606983340126-99ab4feaa64a?w=800"]
+}
+
+# A simple base64 image (1x1 pixel PNG)
+TEST_IMAGE_UPLOAD = {
+    "image_data": "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg==",
+    "filename": "test_image.png"
+}
+
+# Fields every newly registered user must carry, with their default values
+NEW_USER_DEFAULTS = {
+    'phone_verified': False,
+    'id_verified': False,
+    'total_earnings': 0.0,
+    'pending_payout': 0.0
+}
+
 class RentAllAPITester:
     def __init__(self, base_url="https://rentanything-13.preview.emergentagent.com"):
         self.base_url = base_url
+        self.api_url = f"{base_url.rstrip('/')}/api/"
+        # One suffix per run, so login can find the user registration created; nanoseconds
+        # since the epoch, so reruns never collide with users registered by an earlier run
+        self.timestamp = str(time.time_ns())
         self.token = None
         self.user_id = None
+        self.renter_token = None
         self.tests_run = 0
         self.tests_passed = 0
         self.test_results = []
+        # Result lines are buffered and written in one go, so concurrent tests can't interleave them
+        self.log_lines = []
+        self.results_lock = threading.Lock()
+        # One keep-alive session for the whole run instead of a new connection per request,
+        # with enough pooled connections for the widest concurrent phase
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def set_token(self, token):
+        """Authenticate subsequent requests as the user owning this token"""
+        self.token = token
+        self.session.headers['Authorization'] = f'Bearer {token}'
 
     def log_test(self, name, success, details=""):
         """Log test result"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
-            print(f"✅ {name}")
-        else:
-            print(f"❌ {name} - {details}")
-        
-        self.test_results.append({
-            "test": name,
-            "success": success,
-            "details": details
-        })
+        with self.results_lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
+                self.log_lines.append(f"✅ {name}")
+            else:
+                self.log_lines.append(f"❌ {name} - {details}")
+            
+            self.test_results.append({
+                "test": name,
+                "success": success,
+                "details": details
+            })
+
+    def run_concurrently(self, *tests):
+        """Run independent tests at once over the pooled session; only for tests that don't switch users"""
+        with ThreadPoolExecutor(max_workers=len(tests)) as pool:
+            return list(pool.map(lambda test: test(), tests))
 
     def run_test(self, name, method, endpoint, expected_status, data=None, headers=None):
         """Run a single API test"""
-        url = f"{self.base_url}/api/{endpoint}"
-        test_headers = {'Content-Type': 'application/json'}
-        
-        if self.token:
-            test_headers['Authorization'] = f'Bearer {self.token}'
-        
-        if headers:
-            test_headers.update(headers)
+        url = self.api_url + endpoint
 
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=test_headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=test_headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=test_headers, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=test_headers, timeout=10)
-
-            success = response.status_code == expected_status
-            details = f"Status: {response.status_code}"
-            
-            if not success:
-                try:
-                    error_data = response.json()
-                    details += f", Error: {error_data.get('detail', 'Unknown error')}"
-                except:
-                    details += f", Response: {response.text[:100]}"
+            body = orjson.dumps(data) if data is not None else None
+            response = self.session.request(method, url, data=body, headers=headers, timeout=10)
 
-            self.log_test(name, success, details)
-            
-            if success:
+            if response.status_code == expected_status:
+                self.log_test(name, True)
                 try:
-                    return response.json()
-                except:
+                    return orjson.loads(response.content)
+                except orjson.JSONDecodeError:
                     return {}
+
+            # Failure details are only formatted when there is a failure to report
+            details = f"Status: {response.status_code}"
+            try:
+                error_data = orjson.loads(response.content)
+                details += f", Error: {error_data.get('detail', 'Unknown error')}"
+            except orjson.JSONDecodeError:
+                details += f", Response: {response.content[:100].decode('utf-8', 'replace')}"
+            self.log_test(name, False, details)
             return None
 
         except Exception as e:
@@ -80,8 +121,8 @@ class RentAllAPITester:
         return self.run_test("Get Categories", "GET", "categories", 200)
 
     def test_user_registration(self):
-        """Test user registration"""
-        timestamp = datetime.now().strftime("%H%M%S")
+        """Test user registration; returns the new user's token, leaving the session unauthenticated"""
+        timestamp = self.timestamp
         user_data = {
             "email": f"test_user_{timestamp}@example.com",
             "name": f"Test User {timestamp}",
@@ -90,10 +131,9 @@ class RentAllAPITester:
         
         result = self.run_test("User Registration", "POST", "auth/register", 200, user_data)
         if result and 'token' in result:
-            self.token = result['token']
             self.user_id = result['user']['id']
-            return True
-        return False
+            return result['token']
+        return None
 
     def test_user_login(self):
         """Test user login with existing credentials"""
@@ -101,7 +141,7 @@ class RentAllAPITester:
             return False
             
         # Try to login with the registered user
-        timestamp = datetime.now().strftime("%H%M%S")
+        timestamp = self.timestamp
         login_data = {
             "email": f"test_user_{timestamp}@example.com",
             "password": "TestPass123!"
@@ -109,10 +149,24 @@ class RentAllAPITester:
         
         result = self.run_test("User Login", "POST", "auth/login", 200, login_data)
         if result and 'token' in result:
-            self.token = result['token']
+            self.set_token(result['token'])
             return True
         return False
 
+    def test_renter_registration(self):
+        """Register the second user who books the first user's listing; returns their token"""
+        timestamp = self.timestamp + "2"
+        user_data = {
+            "email": f"test_renter_{timestamp}@example.com",
+            "name": f"Test Renter {timestamp}",
+            "password": "TestPass123!"
+        }
+        
+        result = self.run_test("Register Second User", "POST", "auth/register", 200, user_data)
+        if result and 'token' in result:
+            return result['token']
+        return None
+
     def test_get_me(self):
         """Test get current user"""
         if not self.token:
@@ -124,18 +178,7 @@ class RentAllAPITester:
         if not self.token:
             return False
             
-        listing_data = {
-            "title": "Test Camera Rental",
-            "description": "Professional DSLR camera for rent. Perfect for events and photography.",
-            "category": "electronics",
-            "price_per_day": 50.0,
-            "location": "New York, NY",
-            "latitude": 40.7128,
-            "longitude": -74.0060,
-            "images": ["https://images.unsplash.com/photo-1606983340126-99ab4feaa64a?w=800"]
-        }
-        
-        result = self.run_test("Create Listing", "POST", "listings", 200, listing_data)
+        result = self.run_test("Create Listing", "POST", "listings", 200, TEST_LISTING)
         if result and 'id' in result:
             self.listing_id = result['id']
             return True
@@ -157,25 +200,9 @@ class RentAllAPITester:
 
     def test_create_booking(self):
         """Test creating a booking"""
-        if not self.token or not hasattr(self, 'listing_id'):
-            return False
-            
-        # Create another user for booking
-        timestamp = datetime.now().strftime("%H%M%S") + "2"
-        user_data = {
-            "email": f"test_renter_{timestamp}@example.com",
-            "name": f"Test Renter {timestamp}",
-            "password": "TestPass123!"
-        }
-        
-        # Register second user
-        result = self.run_test("Register Second User", "POST", "auth/register", 200, user_data)
-        if not result or 'token' not in result:
+        # Book as the second user registered at the start of the run
+        if not self.token or not self.renter_token or not hasattr(self, 'listing_id'):
             return False
-            
-        # Switch to second user's token
-        old_token = self.token
-        self.token = result['token']
         
         # Create booking
         start_date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
@@ -187,10 +214,9 @@ class RentAllAPITester:
             "end_date": end_date
         }
         
-        booking_result = self.run_test("Create Booking", "POST", "bookings", 200, booking_data)
-        
-        # Switch back to original user
-        self.token = old_token
+        # Sent with the renter's token per request, so the session stays authenticated as the owner
+        renter_auth = {'Authorization': f'Bearer {self.renter_token}'}
+        booking_result = self.run_test("Create Booking", "POST", "bookings", 200, booking_data, renter_auth)
         
         if booking_result and 'id' in booking_result:
             self.booking_id = booking_result['id']
@@ -234,15 +260,7 @@ class RentAllAPITester:
         if not self.token:
             return False
             
-        # Create a simple base64 image (1x1 pixel PNG)
-        base64_image = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg=="
-        
-        image_data = {
-            "image_data": base64_image,
-            "filename": "test_image.png"
-        }
-        
-        result = self.run_test("Upload Image", "POST", "upload/image", 200, image_data)
+        result = self.run_test("Upload Image", "POST", "upload/image", 200, TEST_IMAGE_UPLOAD)
         if result and 'image_id' in result:
             self.image_id = result['image_id']
             return True
@@ -253,14 +271,15 @@ class RentAllAPITester:
         if not hasattr(self, 'image_id'):
             return False
             
-        # Test image retrieval (should return binary data, so we expect 200)
-        url = f"{self.base_url}/api/images/{self.image_id}"
+        # Test image retrieval (should return binary data, so we expect 200).
+        # Only the status and headers are checked, so stream and close without reading the body
+        url = f"{self.api_url}images/{self.image_id}"
         try:
-            response = requests.get(url, timeout=10)
-            success = response.status_code == 200
-            details = f"Status: {response.status_code}"
-            if success:
-                details += f", Content-Type: {response.headers.get('content-type', 'unknown')}"
+            with self.session.get(url, timeout=10, stream=True) as response:
+                success = response.status_code == 200
+                details = f"Status: {response.status_code}"
+                if success:
+                    details += f", Content-Type: {response.headers.get('content-type', 'unknown')}"
             self.log_test("Get Image", success, details)
             return success
         except Exception as e:
@@ -289,7 +308,7 @@ class RentAllAPITester:
 
     def test_user_fields_in_registration(self):
         """Test that registration returns new user fields"""
-        timestamp = datetime.now().strftime("%H%M%S") + "fields"
+        timestamp = self.timestamp + "fields"
         user_data = {
             "email": f"test_fields_{timestamp}@example.com",
             "name": f"Test Fields User {timestamp}",
@@ -299,72 +318,83 @@ class RentAllAPITester:
         result = self.run_test("Registration with New Fields", "POST", "auth/register", 200, user_data)
         if result and 'user' in result:
             user = result['user']
-            required_fields = ['phone_verified', 'id_verified', 'total_earnings', 'pending_payout']
-            missing_fields = [field for field in required_fields if field not in user]
+            missing_fields = NEW_USER_DEFAULTS.keys() - user.keys()
             
             if missing_fields:
-                self.log_test("Check New User Fields", False, f"Missing fields: {missing_fields}")
+                self.log_test("Check New User Fields", False, f"Missing fields: {sorted(missing_fields)}")
                 return False
-            else:
-                # Verify default values
-                expected_values = {
-                    'phone_verified': False,
-                    'id_verified': False,
-                    'total_earnings': 0.0,
-                    'pending_payout': 0.0
-                }
-                
-                for field, expected_value in expected_values.items():
-                    if user[field] != expected_value:
-                        self.log_test("Check New User Fields", False, f"Field {field}: expected {expected_value}, got {user[field]}")
-                        return False
-                
-                self.log_test("Check New User Fields", True, "All new fields present with correct default values")
-                return True
+            
+            # Verify default values
+            wrong_values = {field: user[field] for field, expected_value in NEW_USER_DEFAULTS.items()
+                            if user[field] != expected_value}
+            if wrong_values:
+                self.log_test("Check New User Fields", False, f"Expected {NEW_USER_DEFAULTS}, got {wrong_values}")
+                return False
+            
+            self.log_test("Check New User Fields", True, "All new fields present with correct default values")
+            return True
         
         self.log_test("Check New User Fields", False, "No user data in registration response")
         return False
 
+    def test_image_upload_and_retrieval(self):
+        """Upload an image, then fetch it back"""
+        if self.test_image_upload():
+            return self.test_image_retrieval()
+        return False
+
     def run_all_tests(self):
         """Run all API tests"""
         print("🚀 Starting RentAll API Tests...")
         print(f"Testing against: {self.base_url}")
         print("=" * 50)
 
-        # Test basic endpoints
-        self.test_root_endpoint()
-        self.test_categories()
-
-        # Test new user fields in registration
-        self.test_user_fields_in_registration()
-
-        # Test authentication
-        if self.test_user_registration():
-            self.test_get_me()
-            
-            # Test new image upload APIs
-            if self.test_image_upload():
-                self.test_image_retrieval()
-            
-            # Test new payout APIs
-            self.test_payouts_summary()
-            self.test_my_payouts()
-            self.test_payout_request()
+        # Prime DNS and a keep-alive TLS connection so the first timed test isn't charged for them
+        try:
+            self.session.get(self.api_url, timeout=5)
+        except requests.RequestException:
+            pass
+
+        # Each phase depends on data from the one before; tests within a phase are independent
+        # Test basic endpoints and new user fields in registration
+        self.run_concurrently(
+            self.test_root_endpoint,
+            self.test_categories,
+            self.test_user_fields_in_registration
+        )
+
+        # Test authentication; the renter who books later registers alongside the main user
+        # Neither registration touches the shared session, so its headers only change once both have finished
+        token, self.renter_token = self.run_concurrently(self.test_user_registration, self.test_renter_registration)
+        if token:
+            self.set_token(token)
+            # Test current user, new image upload APIs and new payout APIs
+            self.run_concurrently(
+                self.test_get_me,
+                self.test_image_upload_and_retrieval,
+                self.test_payouts_summary,
+                self.test_my_payouts,
+                self.test_payout_request
+            )
             
             # Test listings
             if self.test_create_listing():
-                self.test_get_listings()
-                self.test_get_featured_listings()
-                self.test_get_my_listings()
+                self.run_concurrently(
+                    self.test_get_listings,
+                    self.test_get_featured_listings,
+                    self.test_get_my_listings
+                )
                 
                 # Test bookings
-                if self.test_create_booking():
-                    self.test_get_my_bookings()
-                    self.test_get_booking_requests()
+                booked = self.test_create_booking()
                 
-                # Test messaging
-                self.test_send_message()
-                self.test_get_conversations()
+                # Test booking reads and messaging
+                reads = [self.test_send_message, self.test_get_conversations]
+                if booked:
+                    reads += [self.test_get_my_bookings, self.test_get_booking_requests]
+                self.run_concurrently(*reads)
+
+        sys.stdout.write("\n".join(self.log_lines) + "\n")
 
         # Print summary
         print("=" * 50)
@@ -378,7 +408,8 @@ class RentAllAPITester:
             return 1
 
 def main():
-    tester = RentAllAPITester()
+    # An optional first argument points the run at another deployment
+    tester = RentAllAPITester(*sys.argv[1:2])
     return tester.run_all_tests()
 
 if __name__ == "__main__":